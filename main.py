@@ -1,65 +1,38 @@
-from sys import exit
-
 import pygame
 
 from scripts.GameStateMachine import GameState
-from scripts.HUD_display import HUD_Manager
+from scripts.dirty_renderer import DirtyRectRenderer
+from scripts.HUD_display import HUD_Manager, HUD_ASSETS
 from scripts.entityClasses.death_cloud_emitter import DeathCloudEmitter
+from scripts.enemy_registry import EnemyRegistry
 from scripts.entityClasses.player import Player
+from scripts.game_loop import GameLoop, StateHandler
 from scripts.game_manager import GM
 from scripts.level import Level, levels
-from scripts.support import SpriteSheet
+from scripts.particle_system import ParticleSystem
+from scripts.render_queue import LAYER_ENEMIES, LAYER_FOG, LAYER_OVERLAY, LAYER_PLAYER, LAYER_PARTICLES, LAYER_HUD, \
+    LAYER_TOP
+from scripts.surface_counter import SurfaceAllocationCounter
 
 # --- Constants ---
 TILE_SIZE = 16
 SCALING_FACTOR = 2
-RENDER_TILE_SIZE = TILE_SIZE * SCALING_FACTOR
+
+# Compose the world at native tile resolution and upscale each frame once by
+# SCALING_FACTOR, instead of pre-scaling every sprite (4x fewer pixels per blit)
+NATIVE_RESOLUTION = False
+SPRITE_SCALE = 1 if NATIVE_RESOLUTION else SCALING_FACTOR
+RENDER_TILE_SIZE = TILE_SIZE * SPRITE_SCALE
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 608
 BG_COLOR = (20, 20, 30)
 
-# --- Initialization ---
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption('Dungeon Explorer')
-clock = pygame.time.Clock()
-
-# --- POPULATE GLOBAL MANAGER ---
-GM.render_tile_size = RENDER_TILE_SIZE
-GM.screen_width = SCREEN_WIDTH
-GM.screen_height = SCREEN_HEIGHT
-
-# --- Initialize State Machine ---
-state_machine = GameState()
-GM.state_machine = state_machine
-
-# --- SPRITE SETUP ---
-TILE_MAP_LOADER = SpriteSheet("graphics/tilemap_packed.png", TILE_SIZE, TILE_SIZE, SCALING_FACTOR)
+TILE_MAP_IMAGE = "graphics/tilemap_packed.png"
 
-# --- PLAYER & LEVEL SETUP ---
-
-# Instantiate Level and store it in GM
-GM.current_level = Level(
-    levels['test'],
-    TILE_MAP_LOADER
-)
-
-# Instantiate Player and store it in GM
-GM.player = Player(TILE_MAP_LOADER)
-GM.player.set_grid_pos(10, 8)
-GM.player.sync_visual_offset()
-
-# Set initial camera position to center on player
-player_pixel_x = GM.player.grid_x * GM.render_tile_size
-player_pixel_y = GM.player.grid_y * GM.render_tile_size
-initial_offset_x = GM.screen_width // 2 - player_pixel_x - (GM.render_tile_size // 2)
-initial_offset_y = GM.screen_height // 2 - player_pixel_y - (GM.render_tile_size // 2)
-GM.current_level.set_initial_camera_position(initial_offset_x, initial_offset_y)
-
-player_group = pygame.sprite.GroupSingle(GM.player)
-GM.hud_manager = HUD_Manager(TILE_MAP_LOADER)
-GM.death_cloud = DeathCloudEmitter()
+# Print the number of surfaces allocated in every frame that allocates any
+# (a steady-state frame should allocate none)
+DEBUG_SURFACE_ALLOCATIONS = False
 
 
 # --- Helper function to handle player input ---
@@ -99,68 +72,150 @@ def handle_action_phase_input(event):
             GM.player.perform_action()
 
 
-# --- Game Loop ---
-while True:
-    # Handle events based on current state
-    current_state = state_machine.current_state.id
+# --- State Handlers ---
+def draw_world(draw_overlay=None, draw_top=None):
+    """
+    Draws the level, the player, particles and the HUD (shared by all in-game states)
+    through the dirty-rect renderer.
+    draw_overlay(surface) is drawn between the enemies and the player,
+    draw_top(surface) above everything else.
+
+    Returns: The screen rectangles that changed.
+    """
+    level = GM.current_level
+    level.update_animated_tiles()
+    renderer.begin_frame(level.level_surface, level.camera.position, level.pop_changed_rects())
+
+    level.draw_enemies(renderer.layer(LAYER_ENEMIES))
+
+    # --- Fog of war: repaint only the cells whose visibility changed ---
+    level.fog.update(*GM.player.get_grid_pos())
+    for fog_rect in level.fog.pop_changed_rects():
+        renderer.mark_dirty(fog_rect.move(level.camera.position))
+    level.fog.draw(renderer.layer(LAYER_FOG))
+
+    if draw_overlay and not GM.has_animations():
+        draw_overlay(renderer.layer(LAYER_OVERLAY))
+
+    player_group.update()
+    player_group.draw(renderer.layer(LAYER_PLAYER))
+    GM.particles.draw(renderer.layer(LAYER_PARTICLES))
+    GM.hud_manager.draw(renderer.layer(LAYER_HUD))
+    hud_dirty_rect = GM.hud_manager.pop_dirty_rect()
+    if hud_dirty_rect:
+        renderer.mark_dirty(hud_dirty_rect)
+
+    if draw_top:
+        draw_top(renderer.layer(LAYER_TOP))
+
+    return renderer.end_frame()
+
+
+def update_world(dt):
+    """
+    Advances the world's time-based effects (damage flashes, particles, HUD
+    animations) by one fixed step of dt seconds (shared by all in-game states).
+    Drawing only samples them, so their speed does not depend on the frame rate.
+    """
+    GM.player.update_damage_flash(dt)
+    GM.current_level.update_enemy_effects(dt)
+    GM.particles.update(dt)
+    GM.hud_manager.update()
+
+
+def world_is_idle():
+    """Returns whether nothing in the world is animating (no tweens, timers, particles or HUD effects)."""
+    if GM.has_animations() or GM.hud_manager.is_animating() or GM.particles.count:
+        return False
+    if GM.player.is_flashing or any(enemy.is_flashing for enemy in GM.current_level.enemies):
+        return False
+    return True
+
+
+def draw_full_screen_color(surface, color):
+    """Fills the whole screen (start / game over screens); the world is redrawn in full afterwards."""
+    surface.fill(color)
+    renderer.invalidate()
+
+
+class StartScreenHandler(StateHandler):
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
+                # --- The HUD's images were preloaded while the start screen was showing ---
+                GM.hud_manager = HUD_Manager(TILE_MAP_LOADER)
+                state_machine.start_game()
+                GM.player.start_movement_phase()
+
+    def draw(self, surface):
+        draw_full_screen_color(surface, (0, 0, 50))
 
-    # Handle animations if they're running
-    if GM.has_animations():
-        GM.resolve_animations()
-        GM.hud_manager.update()
 
-        # Check if animations are done and we need to transition states
-        if not GM.has_animations():
-            if current_state == "player_movement_phase":
-                pass
-            elif current_state == "player_action_phase":
-                state_machine.player_action_complete()
-
-    if current_state == "start_screen":
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                    state_machine.start_game()
-                    GM.player.start_movement_phase()
-
-        screen.fill((0, 0, 50))
-
-    elif current_state == "player_movement_phase":
-        if not GM.has_animations():
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    state_machine.pause_game()
-                else:
-                    handle_movement_phase_input(event)
-
-        GM.hud_manager.update()
-        player_group.update()
-
-    elif current_state == "player_action_phase":
+class MovementPhaseHandler(StateHandler):
+    def accepts_input(self):
+        return not GM.has_animations()
+
+    def is_idle(self):
+        # (The movement range grows out over the first frames of the phase)
+        return world_is_idle() and GM.player.range_reveal_progress >= 1.0
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            state_machine.pause_game()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_m:
+            GM.hud_manager.toggle_minimap()
+        else:
+            handle_movement_phase_input(event)
+
+    def update(self, dt):
+        update_world(dt)
         if not GM.has_animations():
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    state_machine.pause_game()
-                else:
-                    handle_action_phase_input(event)
-
-        GM.hud_manager.update()
-        player_group.update()
-
-    elif current_state == "enemy_turn":
+            GM.player.update_range_reveal(dt)
+
+    def draw(self, surface):
+        return draw_world(self.draw_movement_overlay)
+
+    @staticmethod
+    def draw_movement_overlay(surface):
+        GM.player.draw_movement_range(surface)
+        GM.player.draw_movement_cursor(surface)
+
+
+class ActionPhaseHandler(StateHandler):
+    def accepts_input(self):
+        return not GM.has_animations()
+
+    def is_idle(self):
+        return world_is_idle()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            state_machine.pause_game()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_m:
+            GM.hud_manager.toggle_minimap()
+        else:
+            handle_action_phase_input(event)
+
+    def update(self, dt):
+        update_world(dt)
+
+    def draw(self, surface):
+        return draw_world(GM.player.draw_action_selector)
+
+
+class EnemyTurnHandler(StateHandler):
+    def accepts_input(self):
+        # Keys pressed during the enemy turn stay queued for the player's turn
+        return False
+
+    def is_idle(self):
+        return False
+
+    def update(self, dt):
         if not state_machine.enemy_turn_processed:
             print("[STATE] Processing enemy actions")
 
-            GM.current_level.reset_enemy_turn_tracking()
+            GM.current_level.start_enemy_phase()
 
             enemy_actions_taken = GM.current_level.execute_enemy_turns()
             state_machine.enemy_turn_processed = True
@@ -172,65 +227,121 @@ while True:
                 state_machine.enemy_turn_processed = False
 
         if state_machine.enemy_turn_processed and not GM.has_animations():
-            print("[STATE] Enemy animations complete, moving to player turn")
-            state_machine.enemy_turn_complete()
-            GM.player.start_movement_phase()
-            state_machine.enemy_turn_processed = False
+            if GM.current_level.has_pending_enemy_turns():
+                # --- Fast enemies may act again within the same phase ---
+                GM.current_level.execute_enemy_turns()
+            else:
+                print("[STATE] Enemy animations complete, moving to player turn")
+                state_machine.enemy_turn_complete()
+                GM.player.start_movement_phase()
+                state_machine.enemy_turn_processed = False
+
+        update_world(dt)
+
+    def draw(self, surface):
+        return draw_world()
+
+
+class PauseScreenHandler(StateHandler):
+    def __init__(self):
+        self.pause_surface = None  # Dimming overlay, created on first use
+
+    def is_idle(self):
+        return world_is_idle()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                state_machine.unpause_game()
+
+    def update(self, dt):
+        update_world(dt)
+
+    def draw(self, surface):
+        return draw_world(draw_top=self.draw_pause_overlay)
+
+    def draw_pause_overlay(self, surface):
+        if self.pause_surface is None or self.pause_surface.get_size() != surface.get_size():
+            self.pause_surface = pygame.Surface(surface.get_size())
+            self.pause_surface.set_alpha(128)
+            self.pause_surface.fill((0, 0, 0))
+        surface.blit(self.pause_surface, (0, 0))
+
 
-        GM.hud_manager.update()
+class GameOverHandler(StateHandler):
+    def draw(self, surface):
+        draw_full_screen_color(surface, (50, 0, 0))
 
-    elif current_state == "pause_screen":
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    state_machine.unpause_game()
 
-        GM.hud_manager.update()
+# --- Startup (guarded, so worker processes importing this module do not start the game) ---
+if __name__ == "__main__":
+    # --- Initialization ---
+    pygame.init()
+    if DEBUG_SURFACE_ALLOCATIONS:
+        GM.surface_counter = SurfaceAllocationCounter()
+        GM.surface_counter.install()
+    window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption('Dungeon Explorer')
+    clock = pygame.time.Clock()
 
-    elif current_state == "game_over":
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
+    if NATIVE_RESOLUTION:
+        # Low-resolution back buffer; GameLoop scales it to the window
+        screen = pygame.Surface((SCREEN_WIDTH // SCALING_FACTOR, SCREEN_HEIGHT // SCALING_FACTOR)).convert()
+    else:
+        screen = window
 
-        screen.fill((50, 0, 0))
+    # --- Decode the game's images in the background (the tile map is needed first) ---
+    GM.assets.preload((TILE_MAP_IMAGE,) + HUD_ASSETS)
 
-    # --- Drawing ---
-    if current_state in ["player_movement_phase", "player_action_phase", "enemy_turn", "pause_screen"]:
-        screen.fill(BG_COLOR)
+    # --- POPULATE GLOBAL MANAGER ---
+    GM.render_tile_size = RENDER_TILE_SIZE
+    GM.sprite_scale = SPRITE_SCALE
+    GM.screen_width = screen.get_width()
+    GM.screen_height = screen.get_height()
 
-        GM.current_level.draw(screen)
+    # --- Initialize State Machine ---
+    state_machine = GameState()
+    GM.state_machine = state_machine
 
-        if current_state == "player_movement_phase" and not GM.has_animations():
-            GM.player.draw_movement_range(screen)
-            GM.player.draw_movement_cursor(screen)
+    # --- SPRITE SETUP ---
+    TILE_MAP_LOADER = GM.assets.sheet(TILE_MAP_IMAGE, TILE_SIZE, TILE_SIZE, SPRITE_SCALE, warm_up=True)
+    GM.enemy_registry = EnemyRegistry(TILE_MAP_LOADER)
 
-        if current_state == "player_action_phase" and not GM.has_animations():
-            GM.player.draw_action_selector(screen)
+    # --- PLAYER & LEVEL SETUP ---
 
-        player_group.draw(screen)
+    # Instantiate Level and store it in GM
+    GM.current_level = Level(
+        levels['test'],
+        TILE_MAP_LOADER
+    )
 
-        GM.death_cloud.update_and_draw(screen)
+    # Instantiate Player and store it in GM
+    GM.player = Player(TILE_MAP_LOADER)
+    GM.player.set_grid_pos(10, 8)
+    GM.player.sync_visual_offset()
 
-        GM.hud_manager.draw(screen)
+    # Set initial camera position to center on player
+    GM.current_level.camera.center_on(GM.player.grid_x, GM.player.grid_y)
 
-        if current_state == "pause_screen":
-            pause_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            pause_surface.set_alpha(128)
-            pause_surface.fill((0, 0, 0))
-            screen.blit(pause_surface, (0, 0))
+    player_group = pygame.sprite.GroupSingle(GM.player)
+    # (Particle sizes and speeds are tuned for sprites scaled by SCALING_FACTOR)
+    GM.particles = ParticleSystem(pixel_scale=SPRITE_SCALE / SCALING_FACTOR)
+    GM.death_cloud = DeathCloudEmitter(GM.particles)
 
-    elif current_state == "start_screen":
-        screen.fill((0, 0, 50))
+    # --- Rendering ---
+    renderer = DirtyRectRenderer(screen, BG_COLOR)
 
-    elif current_state == "game_over":
-        screen.fill((50, 0, 0))
+    # --- Game Loop ---
+    game_loop = GameLoop(screen, clock, state_machine, tick_rate=GM.tick_rate,
+                         window=window if NATIVE_RESOLUTION else None)
+    game_loop.register("start_screen", StartScreenHandler())
+    game_loop.register("player_movement_phase", MovementPhaseHandler())
+    game_loop.register("player_action_phase", ActionPhaseHandler())
+    game_loop.register("enemy_turn", EnemyTurnHandler())
+    game_loop.register("pause_screen", PauseScreenHandler())
+    game_loop.register("game_over", GameOverHandler())
+    game_loop.run()
 
-    pygame.display.update()
-    clock.tick(60)
 
 """TODO: 
 animation is buggy again
@@ -242,4 +353,4 @@ FEATURES TO ADD:
 - More enemy types and behaviors
 - Loot system for chests
 - Level progression system
-"""
\ No newline at end of file
+"""
@@ -2,18 +2,38 @@ import pygame
 
 from scripts.animation import EntityFrameAnimation, AnimationManager
 from scripts.game_manager import GM
-from scripts.support import SpriteSheet
+
+# --- Heart assets (also preloaded while the start screen is showing, see HUD_ASSETS) ---
+HEART_FULL_IMAGE = "graphics/hearts/heart_normal_full.png"
+HEART_EMPTY_IMAGE = "graphics/hearts/heart_empty.png"
+HEART_SPAWN_SHEET = "graphics/hearts/heart_normal_spawn_full.png"
+HEART_BLINK_SHEET = "graphics/hearts/heart_normal_blink_full.png"
+HUD_ASSETS = (HEART_FULL_IMAGE, HEART_EMPTY_IMAGE, HEART_SPAWN_SHEET, HEART_BLINK_SHEET)
 
 
 class HUD_Manager:
     """
     Manages and draws all Heads-Up Display elements.
     Provides a single interface for game logic to draw and update the HUD.
+
+    The HUD is composed into one cached surface covering the health bar,
+    re-rendered only when a widget reports a change (health update, heart
+    animation frame); every other frame the cached surface is blitted as is.
     """
 
     def __init__(self, spritesheet_loader):
         self.spritesheet_loader = spritesheet_loader
 
+        # --- Cached HUD layer (sized to the widgets, see render) ---
+        self.surface = None
+        self.needs_render = True
+        self.content_rect = pygame.Rect(0, 0, 0, 0)  # Screen area the cached surface covers
+        self.dirty_rect = None  # Screen area re-rendered since the last pop_dirty_rect()
+
+        # --- Minimap (patched in place by the level's FogOfWar, toggled with M) ---
+        self.show_minimap = False
+        self.margin = 5 * GM.sprite_scale
+
         # Separate animation manager for HUD (doesn't lock game state)
         self.hud_animation_manager = AnimationManager()
 
@@ -21,8 +41,9 @@ class HUD_Manager:
         self.health_bar = HealthBar(
             spritesheet_loader=self.spritesheet_loader,
             hud_animation_manager=self.hud_animation_manager,  # Pass the HUD-specific manager
-            start_x=10,
-            start_y=10
+            start_x=5 * GM.sprite_scale,
+            start_y=5 * GM.sprite_scale,
+            on_change=self.mark_dirty
         )
 
     def reset(self):
@@ -32,51 +53,106 @@ class HUD_Manager:
         """
         # Clear any ongoing HUD animations
         self.hud_animation_manager.clear_all()
+        self.health_bar.release_assets()
         # Recreate health bar with current player health
         self.health_bar = HealthBar(
             spritesheet_loader=self.spritesheet_loader,
             hud_animation_manager=self.hud_animation_manager,
-            start_x=10,
-            start_y=10
+            start_x=5 * GM.sprite_scale,
+            start_y=5 * GM.sprite_scale,
+            on_change=self.mark_dirty
         )
+        self.mark_dirty()
 
     def update_health(self, new_health: int):
         """
         Public method for game logic (e.g., player hit) to trigger a health refresh.
         """
         self.health_bar.set_health(new_health)
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        """Requests a re-render of the cached HUD surface before it is next drawn."""
+        self.needs_render = True
+
+    def render(self):
+        """Re-renders every HUD element into the cached surface."""
+        previous_rect = self.content_rect
+        self.content_rect = self.health_bar.get_rect()
+
+        # --- The surface is only reallocated when the widget area changes size ---
+        if self.surface is None or self.surface.get_size() != self.content_rect.size:
+            self.surface = pygame.Surface(self.content_rect.size, pygame.SRCALPHA)
+        else:
+            self.surface.fill((0, 0, 0, 0))
 
-    def draw(self, display_surface):
-        """Draws all HUD elements"""
         # Draw the Health Bar
-        self.health_bar.draw(display_surface)
+        self.health_bar.draw(self.surface, offset=(-self.content_rect.x, -self.content_rect.y))
+
+        for changed_rect in (previous_rect, self.content_rect):
+            if changed_rect.width and changed_rect.height:
+                self.dirty_rect = changed_rect.copy() if self.dirty_rect is None else self.dirty_rect.union(changed_rect)
+        self.needs_render = False
+
+    def toggle_minimap(self):
+        """Shows or hides the minimap."""
+        self.show_minimap = not self.show_minimap
+
+    def draw_minimap(self, display_surface):
+        """Draws the minimap in the top-right corner; reports it dirty if the fog patched it."""
+        fog = GM.current_level.fog
+        topleft = (GM.screen_width - fog.minimap_surface.get_width() - self.margin, self.margin)
+        patched = fog.minimap_changed
+        minimap_rect = fog.draw_minimap(display_surface, topleft, GM.player.get_grid_pos())
+        if patched:
+            self.dirty_rect = minimap_rect if self.dirty_rect is None else self.dirty_rect.union(minimap_rect)
+
+    def pop_dirty_rect(self):
+        """Returns the screen area re-rendered since the last call, or None if nothing changed."""
+        dirty_rect, self.dirty_rect = self.dirty_rect, None
+        return dirty_rect
+
+    def draw(self, display_surface):
+        """Draws all HUD elements (the cached surface, re-rendered first if anything changed)"""
+        if self.needs_render:
+            self.render()
+        if self.content_rect.width and self.content_rect.height:
+            display_surface.blit(self.surface, self.content_rect.topleft)
+        if self.show_minimap:
+            self.draw_minimap(display_surface)
+
+    def is_animating(self):
+        """Returns whether any HUD animation or scheduled HUD effect is pending."""
+        return self.hud_animation_manager.is_animating() or len(self.hud_animation_manager.timers) > 0
 
     def update(self):
         """Updates all animated HUD elements (delegated)."""
         # Update HUD animations (doesn't affect game state)
-        self.hud_animation_manager.update()
+        self.hud_animation_manager.update(GM.frame_dt)
         # Update the Health Bar
         self.health_bar.update()
 
 
 class Heart(pygame.sprite.Sprite):
+    SPAWN_SPRITE_DURATION = 0.05  # Seconds per spawn sprite frame
+    BLINK_SPRITE_DURATION = 0.065  # Seconds per blink sprite frame
+
     def __init__(self, position: tuple[int, int], spritesheet_loader, hud_animation_manager):
         super().__init__()
         self.rect = pygame.Rect(position, (GM.render_tile_size, GM.render_tile_size))
+        self.on_image_changed = None  # Called whenever the image is replaced (animation frames)
 
         self.state: str = 'blank'  # 'full', 'empty', 'blank'
         self.is_animating: bool = False
         target_size = (GM.render_tile_size, GM.render_tile_size)
 
-        # --- Load Static Images ---
-        self.image_full = pygame.image.load("graphics/hearts/heart_normal_full.png").convert_alpha()
-        self.image_full = pygame.transform.scale(self.image_full, target_size)
-        self.image_empty = pygame.image.load("graphics/hearts/heart_empty.png").convert_alpha()
-        self.image_empty = pygame.transform.scale(self.image_empty, target_size)
+        # --- Static Images (shared by all hearts through the asset manager) ---
+        self.image_full = GM.assets.image(HEART_FULL_IMAGE, target_size)
+        self.image_empty = GM.assets.image(HEART_EMPTY_IMAGE, target_size)
 
         # --- Animation Sheets (Must be FrameSequenceAnimation compatible) ---
-        self.heart_spawn_sheet = SpriteSheet("graphics/hearts/heart_normal_spawn_full.png", 16, 16, 2)
-        self.heart_blink_sheet = SpriteSheet("graphics/hearts/heart_normal_blink_full.png", 16, 16, 2)
+        self.heart_spawn_sheet = GM.assets.sheet(HEART_SPAWN_SHEET, 16, 16, GM.sprite_scale)
+        self.heart_blink_sheet = GM.assets.sheet(HEART_BLINK_SHEET, 16, 16, GM.sprite_scale)
 
         self.image = pygame.Surface((GM.render_tile_size, GM.render_tile_size),
                                     pygame.SRCALPHA)  # Start as blank/transparent
@@ -85,6 +161,26 @@ class Heart(pygame.sprite.Sprite):
         # Reference to HUD animation manager (not GameManager)
         self.hud_animation_manager = hud_animation_manager
 
+    @property
+    def image(self):
+        return self._image
+
+    @image.setter
+    def image(self, image):
+        self._image = image
+        if self.on_image_changed is not None:
+            self.on_image_changed()
+
+    def release_assets(self):
+        """Gives the heart's images and sheets back to the asset manager."""
+        for asset in (self.image_full, self.image_empty, self.heart_spawn_sheet, self.heart_blink_sheet):
+            GM.assets.release(asset)
+
+    @property
+    def spawn_duration(self) -> float:
+        """Length of the spawn animation in seconds."""
+        return self.heart_spawn_sheet.cols * self.heart_spawn_sheet.rows * self.SPAWN_SPRITE_DURATION
+
     def spawn(self, on_sequence_complete=None):
         """Plays the spawn animation and sets the heart to 'full'."""
         if self.is_animating:
@@ -105,7 +201,7 @@ class Heart(pygame.sprite.Sprite):
             target_object=self,
             property_name='image',
             spritesheet=self.heart_spawn_sheet,
-            frame_duration=3,  # Frames per sprite frame
+            sprite_duration=self.SPAWN_SPRITE_DURATION,
             on_complete_callback=on_spawn_complete
         )
 
@@ -137,7 +233,7 @@ class Heart(pygame.sprite.Sprite):
             target_object=self,
             property_name='image',
             spritesheet=self.heart_blink_sheet,
-            frame_duration=4,
+            sprite_duration=self.BLINK_SPRITE_DURATION,
             on_complete_callback=on_blink_complete
         )
 
@@ -153,8 +249,9 @@ class HealthBar:
     Manages a group of Heart sprites
     """
 
-    def __init__(self, spritesheet_loader, hud_animation_manager, start_x=10, start_y=10):
+    def __init__(self, spritesheet_loader, hud_animation_manager, start_x=10, start_y=10, on_change=None):
         self.player = GM.player
+        self.on_change = on_change  # Called when any heart's image changes
         self.spritesheet_loader = spritesheet_loader
 
         # Store HUD animation manager reference
@@ -167,12 +264,12 @@ class HealthBar:
         self.hearts: list[Heart] = []
 
         # Layout properties
-        self.heart_spacing = GM.render_tile_size + 4
+        self.heart_spacing = GM.render_tile_size + 2 * GM.sprite_scale
         self.start_x = start_x
         self.start_y = start_y
 
         self._create_hearts()
-        self._initial_spawn_sequence(0)
+        self._initial_spawn_sequence()
 
     def _create_hearts(self):
         """Initializes all Heart sprites in a row."""
@@ -192,28 +289,26 @@ class HealthBar:
             # Start all hearts blank
             new_heart.image = pygame.Surface((GM.render_tile_size, GM.render_tile_size), pygame.SRCALPHA)
             new_heart.state = 'blank'
+            new_heart.on_image_changed = self.on_change
 
     def start_initial_animation(self):
         """Start the initial spawn animation for the hearts."""
-        self._initial_spawn_sequence(0)
+        self._initial_spawn_sequence()
 
-    def _initial_spawn_sequence(self, index: int):
+    def _initial_spawn_sequence(self):
         """
-        Sequentially spawns hearts up to the player's initial hit_points
+        Sequentially spawns hearts up to the player's initial hit_points,
+        each one starting as the previous one finishes.
         Called once during initialization.
         """
-        if index >= self.player.current_health or index >= self.num_hearts:
-            return
-
-        heart = self.hearts[index]
-
-        # The custom callback that triggers the NEXT heart's animation
-        def chain_spawn_callback():
-            # Trigger the next heart's animation after this one completes
-            self._initial_spawn_sequence(index + 1)
-
-        # Start the spawn animation for the current heart
-        heart.spawn(on_sequence_complete=chain_spawn_callback)
+        delay = 0.0
+        for heart in self.hearts[:min(self.player.current_health, self.num_hearts)]:
+            if delay == 0:
+                heart.spawn()
+            else:
+                # --- Staggered on the HUD timer wheel (doesn't lock the game) ---
+                self.hud_animation_manager.schedule(delay, heart.spawn, blocking=False)
+            delay += heart.spawn_duration
 
     def set_health(self, new_health: int):
         """
@@ -228,9 +323,21 @@ class HealthBar:
                 if heart.state != 'empty':
                     heart.empty(False, 2)
 
-    def draw(self, display_surface):
-        """Draws all heart sprites to the screen."""
-        self.heart_group.draw(display_surface)
+    def release_assets(self):
+        """Gives every heart's assets back to the asset manager."""
+        for heart in self.hearts:
+            heart.release_assets()
+
+    def get_rect(self):
+        """Returns the screen area covered by the hearts."""
+        hearts = self.heart_group.sprites()
+        if not hearts:
+            return pygame.Rect(self.start_x, self.start_y, 0, 0)
+        return hearts[0].rect.unionall([heart.rect for heart in hearts[1:]])
+
+    def draw(self, display_surface, offset=(0, 0)):
+        """Draws all heart sprites, shifted by offset (e.g. into a surface covering only the bar)."""
+        display_surface.blits([(heart.image, heart.rect.move(offset)) for heart in self.heart_group], doreturn=0)
 
     def update(self):
         """Updates heart sprite animations."""
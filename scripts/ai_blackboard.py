@@ -0,0 +1,188 @@
+"""
+Shared squad perception and role coordination for enemies
+"""
+from scripts.pathfinding import compute_distance_field
+
+REGION_SIZE = 8  # Width/height in tiles of the area covered by one blackboard
+FIELD_RADIUS = 32  # Max steps a shared distance field expands from its goal
+MAX_FLANKERS = 2  # Engaged members beyond the chaser that try to flank
+HOLD_RANGE = 3  # Distance at which holding members stop closing in
+
+# --- Squad roles ---
+ROLE_CHASE = "CHASE"
+ROLE_FLANK = "FLANK"
+ROLE_HOLD = "HOLD"
+
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+class Blackboard:
+    """
+    Perception shared by the enemies in one region.
+    Worked out once per enemy phase and read by every member.
+    """
+
+    def __init__(self, region):
+        self.region = region
+        self.members = []
+        self.player_visible = False
+        self.last_known_player_pos = None
+        self.roles: dict[int, str] = {}  # entity_id -> role
+
+    def get_role(self, enemy):
+        """Returns the role assigned to a member this phase, or None."""
+        return self.roles.get(enemy.entity_id)
+
+    def refresh(self, player_pos, player_field):
+        """
+        Updates perception and assigns roles for the current phase.
+        Members are checked nearest first, skipping those farther away than
+        their own view radius, and the line of sight search stops at the
+        first member that spots the player.
+        """
+        player_x, player_y = player_pos
+
+        def manhattan(enemy):
+            return abs(enemy.grid_x - player_x) + abs(enemy.grid_y - player_y)
+
+        self.members.sort(key=manhattan)
+
+        self.player_visible = False
+        for enemy in self.members:
+            if manhattan(enemy) > enemy.view_radius:
+                continue
+            if enemy.can_see_player(player_pos):
+                self.player_visible = True
+                break
+
+        if self.player_visible:
+            self.last_known_player_pos = player_pos
+
+        self.roles.clear()
+        if self.last_known_player_pos is None:
+            return
+
+        # --- Nearest member by walking distance chases, the next ones flank, the rest hold ---
+        def walking_distance(enemy):
+            return player_field.get(enemy.get_grid_pos(), FIELD_RADIUS + manhattan(enemy))
+
+        for index, enemy in enumerate(sorted(self.members, key=walking_distance)):
+            if index == 0:
+                self.roles[enemy.entity_id] = ROLE_CHASE
+            elif index <= MAX_FLANKERS:
+                self.roles[enemy.entity_id] = ROLE_FLANK
+            else:
+                self.roles[enemy.entity_id] = ROLE_HOLD
+
+
+class SquadDirector:
+    """
+    Owns the blackboards of a level and the data they share: the distance
+    fields towards the player (or last known positions) and the set of tiles
+    occupied by enemies.
+    """
+
+    def __init__(self, level):
+        self.level = level
+        self.blackboards: dict[tuple[int, int], Blackboard] = {}
+        self.occupied: set[tuple[int, int]] = set()
+        self.player_pos = None
+        self._fields: dict[tuple[int, int], dict] = {}
+        self._member_boards: dict[int, Blackboard] = {}  # entity_id -> blackboard this phase
+
+    @staticmethod
+    def get_region(pos_x, pos_y):
+        """Returns the key of the region containing a grid position."""
+        return pos_x // REGION_SIZE, pos_y // REGION_SIZE
+
+    def begin_phase(self, player_pos):
+        """
+        Regroups enemies into regions and refreshes every blackboard.
+        Called once at the start of each enemy phase.
+        """
+        self.player_pos = player_pos
+        self._fields.clear()
+        self.occupied.clear()
+        self._member_boards.clear()
+
+        for blackboard in self.blackboards.values():
+            blackboard.members.clear()
+
+        for enemy in self.level.enemies:
+            if not enemy.is_alive:
+                continue
+            self.occupied.add(enemy.get_grid_pos())
+
+            region = self.get_region(enemy.grid_x, enemy.grid_y)
+            blackboard = self.blackboards.get(region)
+            if blackboard is None:
+                blackboard = self.blackboards[region] = Blackboard(region)
+            blackboard.members.append(enemy)
+            self._member_boards[enemy.entity_id] = blackboard
+
+        player_field = self.get_field(player_pos)
+        for blackboard in self.blackboards.values():
+            if blackboard.members:
+                blackboard.refresh(player_pos, player_field)
+
+    def get_blackboard(self, enemy):
+        """Returns the blackboard of the region the enemy was in at the start of the phase."""
+        return self._member_boards.get(enemy.entity_id)
+
+    def get_field(self, goal):
+        """Returns the distance field towards goal, computing it at most once per phase."""
+        field = self._fields.get(goal)
+        if field is None:
+            field = compute_distance_field(self.level, goal[0], goal[1], FIELD_RADIUS)
+            self._fields[goal] = field
+        return field
+
+    def choose_step(self, enemy, goal, avoid=None):
+        """
+        Picks the free neighbouring tile that brings the enemy closest to goal.
+
+        Args:
+            enemy: The enemy about to move.
+            goal: Grid position the distance field leads towards.
+            avoid: Optional grid position to stay away from when choosing
+                between equally good steps (used for flanking).
+
+        Returns:
+            Tuple (x, y) of the next step, or None if no step gets closer.
+        """
+        field = self.get_field(goal)
+        current = field.get(enemy.get_grid_pos())
+
+        best_step = None
+        best_key = None
+        for dx, dy in DIRECTIONS:
+            step = (enemy.grid_x + dx, enemy.grid_y + dy)
+            distance = field.get(step)
+
+            if distance is None or step in self.occupied:
+                continue
+            if current is not None and distance >= current:
+                continue
+
+            spread = 0
+            if avoid is not None:
+                spread = -(abs(step[0] - avoid[0]) + abs(step[1] - avoid[1]))
+
+            key = (distance, spread)
+            if best_key is None or key < best_key:
+                best_step = step
+                best_key = key
+
+        return best_step
+
+    def get_member_with_role(self, blackboard, role):
+        """Returns the first member of a blackboard holding the given role, or None."""
+        for enemy in blackboard.members:
+            if blackboard.roles.get(enemy.entity_id) == role:
+                return enemy
+        return None
+
+    def move_occupant(self, old_pos, new_pos):
+        """Updates the occupied tiles when an enemy commits to a move."""
+        self.occupied.discard(old_pos)
+        self.occupied.add(new_pos)
@@ -1,8 +1,41 @@
+import heapq
+import math
 from enum import Enum
+from itertools import count
 from typing import Any, Callable, Optional
 
 import pygame
 
+from scripts.batch_tween import BatchTweenEngine, EASE_LINEAR
+from scripts.timer_wheel import TimerWheel
+
+# --- Timing ---
+REFERENCE_FPS = 60  # Frame rate that frame-count durations are measured against
+FRAME_TIME = 1 / REFERENCE_FPS
+TIME_EPSILON = 1e-9
+
+
+def frames_to_seconds(frames: float) -> float:
+    """Converts a frame count at REFERENCE_FPS to seconds."""
+    return frames / REFERENCE_FPS
+
+
+def resolve_duration(duration: Optional[float], duration_frames: Optional[float], default: float = 0.0) -> float:
+    """
+    Returns a duration in seconds from either a duration in seconds or a
+    legacy frame count (compatibility shim for frame-based callers).
+    """
+    if duration is not None:
+        return duration
+    if duration_frames is not None:
+        return frames_to_seconds(duration_frames)
+    return default
+
+
+def step_index(elapsed: float, step: float) -> int:
+    """Returns how many whole steps of length step fit into elapsed (robust to float error)."""
+    return int(elapsed / step + TIME_EPSILON)
+
 
 class AnimationType(Enum):
     """Defines the type of animation."""
@@ -13,65 +46,105 @@ class AnimationType(Enum):
 class Animation:
     """
     Base class for all animations.
+
+    An animation's state is a function of the time elapsed since it started
+    (in seconds). Animations that change continuously (ticks_every_frame) are
+    sampled by the AnimationManager each update; all others are only woken
+    up at the times returned by next_wake(), and cost nothing in between.
     """
+    ticks_every_frame = True
 
-    def __init__(self, duration_frames: int):
-        self.duration_frames = duration_frames
-        self.current_frame = 0
+    def __init__(self, duration_frames: Optional[float] = None, duration: Optional[float] = None):
+        self.duration = resolve_duration(duration, duration_frames)
+        self.elapsed = 0.0
+        self.start_time = 0.0  # Manager time the animation was added at
         self.is_complete = False
 
-    def update(self) -> bool:
+    @property
+    def duration_frames(self) -> int:
+        """Duration as a frame count at REFERENCE_FPS (compatibility)."""
+        return round(self.duration * REFERENCE_FPS)
+
+    @property
+    def current_frame(self) -> int:
+        """Elapsed time as a frame count at REFERENCE_FPS (compatibility)."""
+        return step_index(self.elapsed, FRAME_TIME)
+
+    def update(self, dt: float = FRAME_TIME) -> bool:
         """
-        Updates the animation by one frame.
+        Updates the animation by dt seconds (one reference frame by default).
         Returns: True if animation is still running, False if complete.
         """
         if self.is_complete:
             return False
 
-        self.current_frame += 1
+        return self.advance_to(self.elapsed + dt)
+
+    def advance_to(self, elapsed: float) -> bool:
+        """
+        Moves the animation to the given elapsed time in seconds.
+        Returns: True if animation is still running, False if it completed.
+        """
+        if self.is_complete:
+            return False
+
+        self.elapsed = elapsed
 
-        if self.current_frame >= self.duration_frames:
+        if self.elapsed + TIME_EPSILON >= self.duration:
             self.is_complete = True
             self.on_complete()
             return False
 
+        self.apply()
         return True
 
+    def apply(self):
+        """Applies the animation's state for the elapsed time. Override in subclasses."""
+        pass
+
+    def next_wake(self) -> float:
+        """
+        Returns the elapsed time at which the animation next needs updating
+        when it does not tick every frame. Defaults to its completion.
+        """
+        return self.duration
+
     def on_complete(self):
         """Called when the animation finishes. Override in subclasses."""
         pass
 
     def get_progress(self) -> float:
         """Returns animation progress from 0.0 to 1.0."""
-        if self.duration_frames == 0:
+        if self.duration <= 0:
             return 1.0
-        return min(1.0, self.current_frame / self.duration_frames)
+        return min(1.0, self.elapsed / self.duration)
 
 
 class TileSequenceAnimation(Animation):
     """
     Animation that cycles through a sequence of tile indices.
     Used for things like door opening, chest opening, etc., on the map.
+    Only wakes up when the displayed tile changes.
     """
+    ticks_every_frame = False
 
     def __init__(
             self,
             pos_x: int,
             pos_y: int,
             frame_sequence: list[int],
-            duration_frames: int,
-            on_complete_callback: Optional[Callable] = None
+            duration_frames: Optional[float] = None,
+            on_complete_callback: Optional[Callable] = None,
+            duration: Optional[float] = None
     ):
-        super().__init__(duration_frames)
+        super().__init__(duration_frames, duration)
         self.pos_x = pos_x
         self.pos_y = pos_y
         self.frame_sequence = frame_sequence
         self.on_complete_callback = on_complete_callback
 
-        # Calculate frames per tile
-        self.frames_per_tile = duration_frames // len(frame_sequence)
-        if self.frames_per_tile == 0:
-            self.frames_per_tile = 1
+        # Calculate time per tile (at least one reference frame)
+        self.time_per_tile = max(FRAME_TIME, self.duration / len(frame_sequence))
 
     def get_current_tile_id(self) -> int:
         """Returns the current tile ID based on animation progress."""
@@ -79,11 +152,16 @@ class TileSequenceAnimation(Animation):
             return self.frame_sequence[-1]
 
         index = min(
-            self.current_frame // self.frames_per_tile,
+            step_index(self.elapsed, self.time_per_tile),
             len(self.frame_sequence) - 1
         )
         return self.frame_sequence[index]
 
+    def next_wake(self) -> float:
+        """Wakes at the next tile change, or at completion."""
+        next_change = (step_index(self.elapsed, self.time_per_tile) + 1) * self.time_per_tile
+        return min(next_change, self.duration)
+
     def on_complete(self):
         """Execute callback when animation completes."""
         if self.on_complete_callback:
@@ -94,30 +172,29 @@ class EntityFrameAnimation(Animation):
     """
     Animation that cycles a property (usually 'image') on a target object
     using frames loaded from a SpriteSheet. Used for entity animations.
+    Only wakes up when the displayed sprite changes.
     """
+    ticks_every_frame = False
 
     def __init__(
             self,
             target_object: Any,
             property_name: str,
             spritesheet: Any,  # Requires a SpriteSheet object
-            frame_duration: int = 1,  # Frames to display each sprite frame
-            on_complete_callback: Optional[Callable[[], None]] = None
+            frame_duration: Optional[float] = None,  # Frames to display each sprite frame (compatibility)
+            on_complete_callback: Optional[Callable[[], None]] = None,
+            sprite_duration: Optional[float] = None  # Seconds to display each sprite frame
     ):
-        # Calculate total duration based on the sheet size and frame duration
+        # Calculate total duration based on the sheet size and sprite duration
         num_frames = spritesheet.cols * spritesheet.rows
-        total_duration = num_frames * frame_duration
+        self.sprite_duration = resolve_duration(sprite_duration, frame_duration, FRAME_TIME)
 
-        super().__init__(total_duration)  # Use the calculated total duration
+        super().__init__(duration=num_frames * self.sprite_duration)
 
         self.target_object = target_object
         self.property_name = property_name
         self.spritesheet = spritesheet
-        self.frame_duration = frame_duration
         self.on_complete_callback = on_complete_callback
-
-        # Calculate frames per unique sprite
-        self.frames_per_sprite = frame_duration
         self.total_sprites = num_frames
 
     def get_current_sprite(self) -> pygame.Surface:
@@ -127,25 +204,20 @@ class EntityFrameAnimation(Animation):
 
         # Determine which sprite index to show
         sprite_index = min(
-            self.current_frame // self.frames_per_sprite,
+            step_index(self.elapsed, self.sprite_duration),
             self.total_sprites - 1
         )
 
         return self.spritesheet.get_tile(sprite_index)
 
-    def update(self) -> bool:
+    def apply(self):
         """Updates the entity's property with the current sprite frame."""
-        if self.is_complete:
-            return False
-
-        # --- Update Frame and Property ---
-        super().update()  # Updates self.current_frame and checks for completion
-
-        if not self.is_complete:
-            setattr(self.target_object, self.property_name, self.get_current_sprite())
-            return True  # Still running
+        setattr(self.target_object, self.property_name, self.get_current_sprite())
 
-        return False  # Completed this frame (on_complete has been called)
+    def next_wake(self) -> float:
+        """Wakes at the next sprite change, or at completion."""
+        next_change = (step_index(self.elapsed, self.sprite_duration) + 1) * self.sprite_duration
+        return min(next_change, self.duration)
 
     def on_complete(self):
         """Execute callback when animation completes (zero arguments)."""
@@ -165,11 +237,12 @@ class InterpolationAnimation(Animation):
             property_name: str,
             start_value: float | tuple,
             end_value: float | tuple,
-            duration_frames: int,
+            duration_frames: Optional[float] = None,
             easing_function: Optional[Callable[[float], float]] = None,
-            on_complete_callback: Optional[Callable] = None
+            on_complete_callback: Optional[Callable] = None,
+            duration: Optional[float] = None
     ):
-        super().__init__(duration_frames)
+        super().__init__(duration_frames, duration)
         self.target_object = target_object
         self.property_name = property_name
         self.start_value = start_value
@@ -208,19 +281,8 @@ class InterpolationAnimation(Animation):
         """Linear interpolation between two values."""
         return start + (end - start) * t
 
-    def update(self) -> bool:
-        """Updates the interpolation and sets the new value on the target object."""
-        if self.is_complete:
-            return False
-
-        self.current_frame += 1
-
-        if self.current_frame >= self.duration_frames:
-            self.is_complete = True
-            setattr(self.target_object, self.property_name, self.end_value)
-            self.on_complete()
-            return False
-
+    def apply(self):
+        """Sets the interpolated value for the elapsed time on the target object."""
         # Calculate progress and eased value
         progress = self.get_progress()
         eased_progress = self.easing_function(progress)
@@ -235,7 +297,6 @@ class InterpolationAnimation(Animation):
             new_value = self.lerp(self.start_value, self.end_value, eased_progress)
 
         setattr(self.target_object, self.property_name, new_value)
-        return True
 
     def on_complete(self):
         """Ensure final value is set and execute callback."""
@@ -250,62 +311,195 @@ class AnimationManager:
     """
     Manages all active animations in the game.
     Integrated into the GameManager.
+
+    Keeps a timeline (a heap of wake-up times) for every animation and a
+    separate set of the animations that must be sampled every update.
+    Delays and frame sequences sit in the heap until they are due, and
+    completed animations are popped from it rather than filtered out
+    of a list each frame. Movement tweens go to a BatchTweenEngine that
+    evaluates all of them in one vectorized pass, and deferred callbacks
+    go to a TimerWheel.
+
+    Time advances by the real elapsed time passed to update(), so animations
+    run at the same speed whatever the frame rate.
     """
 
     def __init__(self):
-        self.active_animations: list[Animation] = []
+        self.time = 0.0
         self.is_locked = False
+        self._live_count = 0
+        # Insertion-ordered set of animations sampled every update
+        self._ticking: dict[Animation, None] = {}
+        # Heap of (wake_time, sequence, animation); sequence keeps ties in insertion order
+        self._timeline: list[tuple[float, int, Animation]] = []
+        self._sequence = count()
+        self.tweens = BatchTweenEngine()
+        self.timers = TimerWheel(FRAME_TIME)
+
+    @property
+    def active_animations(self) -> list[Animation]:
+        """Returns the animations that are still running (in no particular order)."""
+        return [anim for _, _, anim in self._timeline if not anim.is_complete]
 
     def add_animation(self, animation: Animation):
-        """Add an animation to the active list."""
-        self.active_animations.append(animation)
+        """Add an animation to the timeline, starting at the current time."""
+        animation.start_time = self.time
+        animation.elapsed = 0.0
+        self._live_count += 1
+
+        if animation.ticks_every_frame:
+            self._ticking[animation] = None
+        elif animation.duration > 0:
+            animation.apply()
+
+        self._schedule(animation)
+        if not self.is_locked:
+            self.is_locked = True
+
+    def tween(self, target, attributes, start_value, end_value, duration_frames=None,
+              easing=EASE_LINEAR, on_complete_callback=None, duration=None):
+        """
+        Adds a batched tween of a pair of attributes, starting at the current time.
+        Takes a duration in seconds, or duration_frames for frame-based callers.
+        See BatchTweenEngine.add for the other arguments.
+        """
+        self.tweens.add(target, attributes, start_value, end_value, self.time,
+                        resolve_duration(duration, duration_frames), easing, on_complete_callback)
         if not self.is_locked:
             self.is_locked = True
 
-    def update(self) -> bool:
+    def schedule(self, delay: float, callback: Callable[[], None], blocking: bool = True):
+        """
+        Runs callback once delay seconds have passed (see TimerWheel.schedule).
+        Blocking timers count as running animations and keep the game locked.
+
+        Returns: The Timer, which can be cancelled.
+        """
+        timer = self.timers.schedule(delay, callback, blocking)
+        if blocking and not self.is_locked:
+            self.is_locked = True
+        return timer
+
+    def _schedule(self, animation: Animation):
+        """Pushes the animation's next wake-up onto the timeline."""
+        wake_time = animation.start_time + animation.next_wake()
+        if wake_time <= self.time and animation.elapsed > 0:
+            # Float error put the wake-up in the past: handle it next update
+            wake_time = self.time + TIME_EPSILON
+        heapq.heappush(self._timeline, (wake_time, next(self._sequence), animation))
+
+    def update(self, dt: float = FRAME_TIME) -> bool:
         """
-        Updates all active animations.
+        Advances the timeline by dt seconds (one reference frame by default).
         Returns: True if any animations are still running.
         """
-        if not self.active_animations:
+        if not self.is_animating() and not self.timers:
             self.is_locked = False
             return False
 
-        # Update all animations and remove completed ones
-        self.active_animations = [
-            anim for anim in self.active_animations
-            if anim.update()
-        ]
+        self.time += dt
+        now = self.time
+
+        # --- Sample per-frame animations that are not due to complete ---
+        for anim in self._ticking:
+            elapsed = now - anim.start_time
+            if elapsed < anim.duration:
+                anim.elapsed = elapsed
+                anim.apply()
+
+        # --- Evaluate all batched tweens, then run callbacks of the finished ones ---
+        for callback in self.tweens.update(now):
+            callback()
+
+        # --- Wake up everything that is due (completions may add new animations) ---
+        timeline = self._timeline
+        while timeline and timeline[0][0] <= now + TIME_EPSILON:
+            _, _, anim = heapq.heappop(timeline)
+            if anim.is_complete:
+                continue
+
+            if anim.advance_to(now - anim.start_time):
+                self._schedule(anim)
+            else:
+                self._live_count -= 1
+                self._ticking.pop(anim, None)
+
+        # --- Run deferred callbacks that are due ---
+        for callback in self.timers.advance_to(now):
+            callback()
 
         # If no animations remain, unlock
-        if not self.active_animations:
+        if not self.is_animating():
             self.is_locked = False
             return False
 
         return True
 
+    def sample(self, ahead: float):
+        """
+        Writes tweened values for ahead seconds past the current time without
+        advancing it, so rendering can interpolate between fixed updates.
+        The next update() overwrites them with the real values.
+        """
+        self.tweens.sample(self.time + ahead)
+
+    def next_event_time(self) -> float:
+        """Returns the earliest time at which an animation wakes up, a tween finishes or a timer fires."""
+        next_wake = self._timeline[0][0] if self._timeline else math.inf
+        return min(next_wake, self.tweens.next_end_time(), self.timers.next_expiry_time())
+
+    def resolve_all(self, step: float = FRAME_TIME, max_updates: int = 100_000) -> int:
+        """
+        Runs every queued animation and the callback chains they start to
+        completion, synchronously (instant mode).
+
+        Time still moves in whole steps of length step, exactly as if update(step)
+        were called once per frame, but steps in which nothing is due are
+        skipped in one jump. Callbacks therefore fire in the same order and
+        with the same game state as in real-time play.
+
+        Returns: The number of updates it took.
+        """
+        updates = 0
+        while self.is_animating():
+            if updates >= max_updates:
+                print(f"[ANIMATION] resolve_all gave up after {updates} updates")
+                break
+
+            wait = self.next_event_time() - self.time - TIME_EPSILON
+            steps = max(1, math.ceil(wait / step)) if wait != math.inf else 1
+            self.update(steps * step)
+            updates += 1
+
+        return updates
+
     def clear_all(self):
         """Clears all active animations."""
-        self.active_animations.clear()
+        self._ticking.clear()
+        self._timeline.clear()
+        self.tweens.clear()
+        self.timers.clear()
+        self._live_count = 0
         self.is_locked = False
 
     def is_animating(self) -> bool:
-        """Returns whether any animations are currently active."""
-        return len(self.active_animations) > 0
+        """Returns whether any animations (or blocking timers) are currently active."""
+        return self._live_count > 0 or len(self.tweens) > 0 or self.timers.blocking_count > 0
 
 
 class DelayAnimation(Animation):
-    """Simple animation that does nothing but wait for a specified duration."""
+    """
+    Simple animation that does nothing but wait for a specified duration.
+    Sleeps on the timeline until it is due. New code should prefer
+    AnimationManager.schedule (GM.schedule) for deferred callbacks.
+    """
+    ticks_every_frame = False
 
-    def __init__(self, duration_frames, on_complete_callback=None):
-        super().__init__(duration_frames)
+    def __init__(self, duration_frames=None, on_complete_callback=None, duration=None):
+        super().__init__(duration_frames, duration)
         self.on_complete_callback = on_complete_callback
 
-    def update(self):
-        """Just track time without modifying any properties."""
-        self.current_frame += 1
-        if self.current_frame >= self.duration_frames:
-            self.is_complete = True
-            if self.on_complete_callback:
-                self.on_complete_callback()
-        return not self.is_complete
\ No newline at end of file
+    def on_complete(self):
+        """Execute callback when the delay has elapsed."""
+        if self.on_complete_callback:
+            self.on_complete_callback()
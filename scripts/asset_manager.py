@@ -0,0 +1,138 @@
+"""
+Central asset cache: images and sprite sheets are loaded once per
+(path, parameters), shared, and reference-counted.
+"""
+import threading
+
+import pygame
+
+from scripts.support import SpriteSheet
+
+
+class AssetManager:
+    """
+    Loads images and sprite sheets on request and hands out shared instances.
+
+    Every image()/sheet() call takes a reference; release() gives it back
+    and the asset is dropped once nobody holds it. Returned surfaces are
+    shared and must not be modified.
+
+    preload() decodes a manifest of files on a background thread (e.g. while
+    the start screen is showing). Only the file decoding runs there;
+    converting to the display format and scaling happen on the main thread
+    when an asset is first requested, which then waits only if that file
+    has not been decoded yet.
+    """
+
+    def __init__(self):
+        self._assets = {}  # key -> image or SpriteSheet
+        self._ref_counts = {}  # key -> number of holders
+        self._keys = {}  # id(asset) -> key, for release()
+
+        # --- Background preloading ---
+        self._decoded = {}  # path -> surface decoded by the preload thread
+        self._pending = set()  # paths the preload thread has yet to decode
+        self._lock = threading.Lock()
+        self._file_decoded = threading.Condition(self._lock)
+        self._preload_thread = None
+
+    # --- Preloading ---
+
+    def preload(self, paths):
+        """Starts decoding the given image files on a background thread."""
+        with self._lock:
+            paths = [path for path in paths if path not in self._decoded and path not in self._pending]
+            self._pending.update(paths)
+
+        if not paths:
+            return
+
+        self._preload_thread = threading.Thread(target=self._preload_worker, args=(paths,),
+                                                name="asset-preload", daemon=True)
+        self._preload_thread.start()
+        print(f"[ASSETS] Preloading {len(paths)} files")
+
+    def _preload_worker(self, paths):
+        for path in paths:
+            try:
+                surface = pygame.image.load(path)
+            except (pygame.error, FileNotFoundError) as error:
+                print(f"[ASSETS] Preload of {path} failed: {error}")
+                surface = None
+
+            with self._lock:
+                self._pending.discard(path)
+                if surface is not None:
+                    self._decoded[path] = surface
+                self._file_decoded.notify_all()
+
+    def is_preloading(self):
+        """Returns whether the preload thread still has files to decode."""
+        with self._lock:
+            return bool(self._pending)
+
+    def _load_file(self, path):
+        """Returns the decoded file, from the preload thread if it has (or will have) it."""
+        with self._lock:
+            while path in self._pending:
+                self._file_decoded.wait()
+            surface = self._decoded.pop(path, None)
+
+        if surface is None:
+            surface = pygame.image.load(path)
+        return surface
+
+    # --- Shared assets ---
+
+    def image(self, path, size=None):
+        """
+        Returns the image at path (converted with alpha), scaled to size if given.
+        Takes a reference; call release() when done with it.
+        """
+        key = ('image', path, size)
+        asset = self._acquire(key)
+        if asset is None:
+            asset = self._load_file(path).convert_alpha()
+            if size is not None:
+                asset = pygame.transform.scale(asset, size)
+            self._store(key, asset)
+        return asset
+
+    def sheet(self, path, tile_width, tile_height, scale_factor=2, warm_up=False):
+        """
+        Returns the SpriteSheet for path with the given tiling and scale.
+        Takes a reference; call release() when done with it.
+        """
+        key = ('sheet', path, tile_width, tile_height, scale_factor)
+        asset = self._acquire(key)
+        if asset is None:
+            asset = SpriteSheet(path, tile_width, tile_height, scale_factor,
+                                warm_up=warm_up, image=self._load_file(path))
+            self._store(key, asset)
+        return asset
+
+    def _acquire(self, key):
+        asset = self._assets.get(key)
+        if asset is not None:
+            self._ref_counts[key] += 1
+        return asset
+
+    def _store(self, key, asset):
+        self._assets[key] = asset
+        self._ref_counts[key] = 1
+        self._keys[id(asset)] = key
+
+    def release(self, asset):
+        """Gives back a reference taken by image() or sheet(); unused assets are dropped."""
+        key = self._keys.get(id(asset))
+        if key is None:
+            return
+
+        self._ref_counts[key] -= 1
+        if self._ref_counts[key] <= 0:
+            del self._assets[key]
+            del self._ref_counts[key]
+            del self._keys[id(asset)]
+
+    def __len__(self):
+        return len(self._assets)
@@ -0,0 +1,179 @@
+"""
+Vectorized tween engine for moving many entities at once.
+
+Every tween drives a pair of numeric attributes (e.g. slide_x/slide_y or a
+camera offset) on a target object. Start/end values, timing and easing are
+kept in NumPy arrays so all tweens are evaluated in a single pass per frame.
+Times and durations are in seconds.
+"""
+from itertools import count
+
+import numpy as np
+
+# --- Easing IDs (match the InterpolationAnimation easing functions) ---
+EASE_LINEAR = 0
+EASE_IN_QUAD = 1
+EASE_OUT_QUAD = 2
+EASE_IN_OUT_QUAD = 3
+
+
+def apply_easing(t, easing):
+    """Evaluates the easing function selected per row by easing on progress array t."""
+    in_out = np.where(t < 0.5, 2 * t * t, 1 - (-2 * t + 2) ** 2 / 2)
+    return np.select(
+        [easing == EASE_IN_QUAD, easing == EASE_OUT_QUAD, easing == EASE_IN_OUT_QUAD],
+        [t * t, 1 - (1 - t) * (1 - t), in_out],
+        default=t
+    )
+
+
+class BatchTweenEngine:
+    """
+    Stores two-channel tweens as rows of NumPy arrays.
+    Rows are kept contiguous; finished rows are compacted out in one step.
+    """
+
+    def __init__(self, capacity=64):
+        self._capacity = capacity
+        self._count = 0
+        self._sequence = count()
+
+        # --- Per-row numeric data ---
+        self._start = np.zeros((capacity, 2))
+        self._end = np.zeros((capacity, 2))
+        self._start_time = np.zeros(capacity)
+        self._duration = np.zeros(capacity)
+        self._easing = np.zeros(capacity, dtype=np.int8)
+        self._order = np.zeros(capacity, dtype=np.int64)  # Insertion order, for callback ordering
+
+        # --- Per-row object data ---
+        self._targets = []
+        self._attributes = []
+        self._callbacks = []
+
+    def __len__(self):
+        return self._count
+
+    def _grow(self):
+        """Doubles the capacity of every array."""
+        self._capacity *= 2
+        for name in ('_start', '_end', '_start_time', '_duration', '_easing', '_order'):
+            old = getattr(self, name)
+            new = np.zeros((self._capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+    def add(self, target, attributes, start_value, end_value, start_time, duration,
+            easing=EASE_LINEAR, on_complete_callback=None):
+        """
+        Adds a tween of two attributes on target.
+
+        Args:
+            target: Object whose attributes are written each frame.
+            attributes: Tuple of the two attribute names, e.g. ('slide_x', 'slide_y').
+            start_value: Tuple of the two start values.
+            end_value: Tuple of the two end values.
+            start_time: Time in seconds the tween starts at.
+            duration: Length of the tween in seconds.
+            easing: One of the EASE_* IDs.
+            on_complete_callback: Optional zero-argument callback run when the tween ends.
+        """
+        if self._count == self._capacity:
+            self._grow()
+
+        row = self._count
+        self._start[row] = start_value
+        self._end[row] = end_value
+        self._start_time[row] = start_time
+        self._duration[row] = duration
+        self._easing[row] = easing
+        self._order[row] = next(self._sequence)
+
+        self._targets.append(target)
+        self._attributes.append(attributes)
+        self._callbacks.append(on_complete_callback)
+        self._count += 1
+
+    def update(self, now):
+        """
+        Evaluates every tween at time now (seconds) and writes the values back.
+        Finished tweens get their exact end values and are removed.
+
+        Returns:
+            List of completion callbacks to run, in the order the tweens were added.
+        """
+        n = self._count
+        if not n:
+            return []
+
+        done = self._write_values(now)
+        if not done.any():
+            return []
+
+        finished_rows = np.flatnonzero(done)
+        finished_rows = finished_rows[np.argsort(self._order[finished_rows])]
+        callbacks = [self._callbacks[row] for row in finished_rows if self._callbacks[row]]
+
+        self._remove(done)
+        return callbacks
+
+    def sample(self, now):
+        """
+        Writes the values every tween has at time now without finishing any
+        of them (used to interpolate rendering between fixed updates).
+        """
+        if self._count:
+            self._write_values(now)
+
+    def _write_values(self, now):
+        """
+        Evaluates every row at time now in one vectorized pass and writes the
+        values back to the targets. Returns the boolean mask of finished rows.
+        """
+        n = self._count
+        elapsed = now - self._start_time[:n]
+        duration = self._duration[:n]
+        progress = np.clip(elapsed / np.maximum(duration, 1e-9), 0.0, 1.0)
+        eased = apply_easing(progress, self._easing[:n])
+        start = self._start[:n]
+        values = start + (self._end[:n] - start) * eased[:, None]
+
+        done = elapsed + 1e-9 >= duration
+        if done.any():
+            values[done] = self._end[:n][done]
+
+        # --- Bulk write-back to the target objects ---
+        for target, (attr_x, attr_y), (value_x, value_y) in zip(self._targets, self._attributes, values.tolist()):
+            setattr(target, attr_x, value_x)
+            setattr(target, attr_y, value_y)
+
+        return done
+
+    def next_end_time(self):
+        """Returns the earliest time (seconds) at which a tween finishes, or infinity if there are none."""
+        n = self._count
+        if not n:
+            return float('inf')
+        return float((self._start_time[:n] + self._duration[:n]).min())
+
+    def _remove(self, done):
+        """Compacts out the rows flagged in the boolean mask done."""
+        n = self._count
+        keep = ~done
+        kept = int(keep.sum())
+
+        for array in (self._start, self._end, self._start_time, self._duration, self._easing, self._order):
+            array[:kept] = array[:n][keep]
+
+        keep_list = keep.tolist()
+        self._targets = [item for item, k in zip(self._targets, keep_list) if k]
+        self._attributes = [item for item, k in zip(self._attributes, keep_list) if k]
+        self._callbacks = [item for item, k in zip(self._callbacks, keep_list) if k]
+        self._count = kept
+
+    def clear(self):
+        """Drops every tween without running callbacks."""
+        self._count = 0
+        self._targets.clear()
+        self._attributes.clear()
+        self._callbacks.clear()
@@ -0,0 +1,132 @@
+"""
+Camera: owns the scroll offset of the world on screen, its panning tween,
+pixel snapping and the world/screen transforms.
+"""
+from scripts.batch_tween import EASE_IN_OUT_QUAD
+from scripts.game_manager import GM
+
+
+class Camera:
+    """
+    The offset is the screen position of the map's top-left corner. It is
+    tweened as a float, but everything drawn with the camera uses the
+    snapped (rounded) position, so terrain, entities and overlays always
+    move together by whole pixels.
+
+    The visible tile bounds are cached per snapped position, so culling,
+    chunk streaming and rendering share one computation per frame.
+    """
+
+    def __init__(self, screen_width, screen_height, tile_size):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.tile_size = tile_size
+
+        # --- Offset (tweened) and target ---
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.target_x = 0.0
+        self.target_y = 0.0
+
+        # --- Cache of visible_tile_bounds ---
+        self._bounds_key = None
+        self._bounds = None
+
+    # --- Positioning ---
+
+    def offset_to_center(self, grid_x, grid_y):
+        """Returns the offset that centers the given grid tile on screen."""
+        return (self.screen_width // 2 - grid_x * self.tile_size - self.tile_size // 2,
+                self.screen_height // 2 - grid_y * self.tile_size - self.tile_size // 2)
+
+    def set_offset(self, offset_x, offset_y):
+        """Moves the camera instantly (no animation)."""
+        self.offset_x = float(offset_x)
+        self.offset_y = float(offset_y)
+        self.target_x = float(offset_x)
+        self.target_y = float(offset_y)
+
+    def center_on(self, grid_x, grid_y):
+        """Centers the camera on a grid tile instantly."""
+        self.set_offset(*self.offset_to_center(grid_x, grid_y))
+
+    def pan_to(self, offset_x, offset_y, duration=None):
+        """
+        Smoothly animates the camera from its current offset to the target offset.
+
+        Args:
+            offset_x: Target X offset
+            offset_y: Target Y offset
+            duration: Animation duration in seconds (defaults to GM.ANIMATION_DELAY)
+        """
+        if duration is None:
+            duration = GM.ANIMATION_DELAY
+
+        self.target_x = offset_x
+        self.target_y = offset_y
+
+        # Tween both offsets together
+        GM.add_tween(
+            target=self,
+            attributes=('offset_x', 'offset_y'),
+            start_value=(self.offset_x, self.offset_y),
+            end_value=(offset_x, offset_y),
+            duration=duration,
+            easing=EASE_IN_OUT_QUAD
+        )
+
+    def pan_to_tile(self, grid_x, grid_y, duration=None):
+        """Smoothly animates the camera to center on a grid tile."""
+        self.pan_to(*self.offset_to_center(grid_x, grid_y), duration=duration)
+
+    # --- Queries ---
+
+    @property
+    def position(self):
+        """The pixel-snapped screen position of the map's top-left corner."""
+        return round(self.offset_x), round(self.offset_y)
+
+    @property
+    def screen_center(self):
+        """The screen pixel at the middle of the view."""
+        return self.screen_width // 2, self.screen_height // 2
+
+    def visible_tile_bounds(self, margin=1):
+        """
+        Returns (min_x, min_y, max_x, max_y), the inclusive range of grid
+        tiles on screen, widened by margin tiles (for sprites sliding or
+        lunging in from just off screen).
+        """
+        camera_x, camera_y = self.position
+        key = (camera_x, camera_y, margin)
+        if key != self._bounds_key:
+            tile_size = self.tile_size
+            self._bounds = (
+                -camera_x // tile_size - margin,
+                -camera_y // tile_size - margin,
+                (self.screen_width - 1 - camera_x) // tile_size + margin,
+                (self.screen_height - 1 - camera_y) // tile_size + margin
+            )
+            self._bounds_key = key
+        return self._bounds
+
+    # --- Transforms ---
+
+    def world_to_screen(self, world_x, world_y):
+        """Converts world pixels (map surface coordinates) to screen pixels."""
+        camera_x, camera_y = self.position
+        return world_x + camera_x, world_y + camera_y
+
+    def screen_to_world(self, screen_x, screen_y):
+        """Converts screen pixels to world pixels."""
+        camera_x, camera_y = self.position
+        return screen_x - camera_x, screen_y - camera_y
+
+    def grid_to_screen(self, grid_x, grid_y):
+        """Returns the screen position of a grid tile's top-left corner."""
+        return self.world_to_screen(grid_x * self.tile_size, grid_y * self.tile_size)
+
+    def screen_to_grid(self, screen_x, screen_y):
+        """Returns the grid tile under a screen pixel."""
+        world_x, world_y = self.screen_to_world(screen_x, screen_y)
+        return world_x // self.tile_size, world_y // self.tile_size
@@ -0,0 +1,170 @@
+"""
+Dirty-rectangle rendering: only the screen regions that changed since the
+last frame are recomposed and sent to the display.
+"""
+import pygame
+
+from scripts.render_queue import RenderQueue, item_key, key_rect
+
+# --- Tuning ---
+MERGE_SLACK = 8  # Rects closer than this many pixels are merged into one
+FULL_REDRAW_FRACTION = 0.5  # Above this share of the screen, redraw everything
+
+
+class DirtyRectRenderer:
+    """
+    Composes the world from a terrain back buffer and recorded layers.
+
+    The back buffer holds the terrain as seen through the camera. When the
+    camera pans, the buffer is scrolled and only the newly exposed strips are
+    copied from the level surface. Layers (entities, overlays, particles, HUD)
+    are collected each frame in a RenderQueue; items that appeared, vanished
+    or moved mark their old and new rectangles dirty, and only those regions
+    are redrawn.
+    """
+
+    def __init__(self, screen, background_color):
+        self.screen = screen
+        self.background_color = background_color
+        self.screen_rect = screen.get_rect()
+        self.back_buffer = pygame.Surface(self.screen_rect.size)
+
+        self._terrain_surface = None
+        self._camera = None
+        self.queue = RenderQueue(self.screen_rect.size)
+        self._previous_items: dict[int, dict] = {}  # Layer -> {item key: source} (keeps the sources alive)
+        self._dirty: list[pygame.Rect] = []
+        self._full_redraw = True
+
+    def invalidate(self):
+        """Forces a full redraw on the next frame (e.g. after another screen was shown)."""
+        self._full_redraw = True
+
+    # --- Terrain ---
+
+    def begin_frame(self, terrain_surface, camera_offset, changed_world_rects=()):
+        """
+        Starts a frame: brings the terrain back buffer up to date.
+
+        Args:
+            terrain_surface: The level surface (whole map, world pixels).
+            camera_offset: Integer (x, y) screen position of the map's top-left corner.
+            changed_world_rects: Map regions (world pixels) redrawn since the last frame.
+        """
+        self.queue.clear()
+
+        if self._full_redraw or terrain_surface is not self._terrain_surface:
+            self._terrain_surface = terrain_surface
+            self._camera = camera_offset
+            self._redraw_back_buffer(self.screen_rect)
+            self._full_redraw = True
+            return
+
+        # --- Camera pan: scroll what is already there, fill in the exposed strips ---
+        if camera_offset != self._camera:
+            dx = camera_offset[0] - self._camera[0]
+            dy = camera_offset[1] - self._camera[1]
+            self._camera = camera_offset
+
+            if abs(dx) >= self.screen_rect.width or abs(dy) >= self.screen_rect.height:
+                self._redraw_back_buffer(self.screen_rect)
+            else:
+                self.back_buffer.scroll(dx, dy)
+                width, height = self.screen_rect.size
+                if dx > 0:
+                    self._redraw_back_buffer(pygame.Rect(0, 0, dx, height))
+                elif dx < 0:
+                    self._redraw_back_buffer(pygame.Rect(width + dx, 0, -dx, height))
+                if dy > 0:
+                    self._redraw_back_buffer(pygame.Rect(0, 0, width, dy))
+                elif dy < 0:
+                    self._redraw_back_buffer(pygame.Rect(0, height + dy, width, -dy))
+
+            # Everything on screen moved
+            self._full_redraw = True
+
+        # --- Tiles that changed (doors, chests, animated tiles), also after a pan ---
+        for world_rect in changed_world_rects:
+            screen_rect = pygame.Rect(world_rect).move(camera_offset).clip(self.screen_rect)
+            if screen_rect.width and screen_rect.height:
+                self._redraw_back_buffer(screen_rect)
+                self._dirty.append(screen_rect)
+
+    def _redraw_back_buffer(self, rect):
+        """Copies the terrain seen through the camera into a region of the back buffer."""
+        self.back_buffer.fill(self.background_color, rect)
+        source_area = rect.move(-self._camera[0], -self._camera[1])
+        self.back_buffer.blit(self._terrain_surface, rect.topleft, source_area)
+
+    # --- Layers ---
+
+    def mark_dirty(self, rect):
+        """Marks a screen region as changed (e.g. a cached layer surface re-rendered in place)."""
+        self._dirty.append(pygame.Rect(rect))
+
+    def layer(self, layer):
+        """
+        Returns the recording surface for a layer (see the LAYER_* constants
+        in render_queue); draw into it with the usual draw functions.
+        """
+        return self.queue.surface(layer)
+
+    def end_frame(self):
+        """
+        Composes the dirty regions onto the screen.
+
+        Returns:
+            List of screen rectangles to pass to pygame.display.update.
+        """
+        # --- Compare every layer with the previous frame (rects only for the items that changed) ---
+        current_items = {}
+        for layer, layer_items in self.queue.layers():
+            items = {item_key(item): item[0] for item in layer_items}
+            current_items[layer] = items
+
+            if not self._full_redraw:
+                previous = self._previous_items.get(layer, {})
+                self._dirty.extend(key_rect(key, items[key]) for key in items.keys() - previous.keys())
+                self._dirty.extend(key_rect(key, previous[key]) for key in previous.keys() - items.keys())
+        self._previous_items = current_items
+
+        # --- Work out the regions to recompose ---
+        if self._full_redraw:
+            regions = [self.screen_rect]
+        else:
+            regions = self._merge(self._dirty)
+            if sum(rect.width * rect.height for rect in regions) > \
+                    self.screen_rect.width * self.screen_rect.height * FULL_REDRAW_FRACTION:
+                regions = [self.screen_rect]
+
+        self._dirty = []
+        self._full_redraw = False
+
+        # --- Recompose: terrain, then the queued items touching the region ---
+        for region in regions:
+            self.screen.set_clip(region)
+            self.screen.blit(self.back_buffer, region, region)
+            self.queue.flush(self.screen)
+        self.screen.set_clip(None)
+
+        return regions
+
+    def _merge(self, rects):
+        """Clips rects to the screen and merges overlapping (or nearly touching) ones."""
+        merged = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if not rect.width or not rect.height:
+                continue
+
+            # --- Absorb every merged rect this one touches, until stable ---
+            grown = True
+            while grown:
+                grown = False
+                inflated = rect.inflate(MERGE_SLACK, MERGE_SLACK)
+                for index in range(len(merged) - 1, -1, -1):
+                    if inflated.colliderect(merged[index]):
+                        rect = rect.union(merged.pop(index))
+                        grown = True
+            merged.append(rect)
+        return merged
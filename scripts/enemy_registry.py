@@ -0,0 +1,111 @@
+"""
+Data-driven enemy archetypes, loaded from data/enemy_archetypes.csv
+"""
+from csv import DictReader
+
+from scripts.entityClasses.enemy import Enemy
+from scripts.entityClasses.ghost import Ghost
+from scripts.tileset import Tile
+
+ARCHETYPE_DATA = 'data/enemy_archetypes.csv'
+
+# --- Enemy classes an archetype may name in its enemy_class column ---
+ENEMY_CLASSES = {
+    'Enemy': Enemy,
+    'Ghost': Ghost,
+}
+
+
+class EnemyArchetype:
+    """
+    Read-only record describing one kind of enemy.
+    A single archetype (and its sprite surface) is shared by every instance
+    spawned from it, so instances never hold their own copy of the sprite.
+    """
+    __slots__ = ('tile_id', 'name', 'enemy_class', 'ai_profile', 'sprite_id', 'sprite',
+                 'max_health', 'move_speed', 'action_speed', 'view_radius')
+
+    def __init__(self, tile_id, name, enemy_class, ai_profile, sprite_id, sprite,
+                 max_health, move_speed, action_speed, view_radius):
+        self.tile_id = tile_id
+        self.name = name
+        self.enemy_class = enemy_class
+        self.ai_profile = ai_profile
+        self.sprite_id = sprite_id
+        self.sprite = sprite
+        self.max_health = max_health
+        self.move_speed = move_speed
+        self.action_speed = action_speed
+        self.view_radius = view_radius
+
+
+class EnemyRegistry:
+    """
+    Maps enemy layer tile IDs (Tile.get_enemy_tiles()) to EnemyArchetypes
+    and spawns enemies from them.
+    """
+
+    def __init__(self, tile_map_loader, path=ARCHETYPE_DATA):
+        self.tile_map_loader = tile_map_loader
+        self.archetypes: dict[int, EnemyArchetype] = self.load(path)
+
+    def load(self, path):
+        """Reads archetype records from a CSV file with a header row."""
+        archetypes = {}
+        enemy_tiles = Tile.get_enemy_tiles()
+
+        with open(path) as data:
+            for row in DictReader(data):
+                tile_id = int(row['tile_id'])
+                if tile_id not in enemy_tiles:
+                    raise ValueError(f"Archetype '{row['name']}' uses non-enemy tile ID {tile_id}")
+                if row['enemy_class'] not in ENEMY_CLASSES:
+                    raise ValueError(f"Archetype '{row['name']}' has unknown class '{row['enemy_class']}'")
+
+                sprite_id = int(row['sprite_id'])
+                archetypes[tile_id] = EnemyArchetype(
+                    tile_id=tile_id,
+                    name=row['name'],
+                    enemy_class=ENEMY_CLASSES[row['enemy_class']],
+                    ai_profile=row['ai_profile'],
+                    sprite_id=sprite_id,
+                    sprite=self.tile_map_loader.get_tile(sprite_id),
+                    max_health=int(row['max_health']),
+                    move_speed=int(row['move_speed']),
+                    action_speed=int(row['action_speed']),
+                    view_radius=int(row['view_radius'])
+                )
+
+        return archetypes
+
+    def get(self, tile_id):
+        """Returns the archetype for a tile ID, or None if there is none."""
+        return self.archetypes.get(tile_id)
+
+    def spawn(self, tile_id, spawn_x, spawn_y, pool=None):
+        """
+        Creates an enemy of the archetype mapped to tile_id.
+        If an EntityPool is given, a despawned enemy is reused when possible.
+
+        Returns:
+            The new Enemy, or None if no archetype is mapped to tile_id.
+        """
+        archetype = self.archetypes.get(tile_id)
+        if archetype is None:
+            return None
+
+        if pool is not None:
+            return pool.acquire(
+                archetype.enemy_class,
+                self.tile_map_loader,
+                spawn_x=spawn_x,
+                spawn_y=spawn_y,
+                archetype=archetype
+            )
+
+        return archetype.enemy_class(
+            tile_map_loader=self.tile_map_loader,
+            spawn_x=spawn_x,
+            spawn_y=spawn_y,
+            archetype=archetype
+        )
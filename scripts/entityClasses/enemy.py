@@ -2,28 +2,50 @@ import random
 
 import pygame
 
+from scripts.ai_blackboard import ROLE_CHASE, ROLE_FLANK, ROLE_HOLD, HOLD_RANGE
 from scripts.entity_actions import move_entity
 from scripts.pathfinding import get_next_step_towards
+from scripts.simulation import GameSnapshot, ACTION_ATTACK, ACTION_MOVE
 from .entity import Entity
 from .player import Player
 from ..game_manager import GM
-from ..tileset import Tile
+from ..turn_scheduler import NORMAL_SPEED
 
 
 class Enemy(Entity):
-    def __init__(self, tile_map_loader, spawn_x, spawn_y):
+    def __init__(self, tile_map_loader, spawn_x, spawn_y, archetype=None):
         super().__init__(tile_map_loader)
 
         # --- Essential Game References ---
         self.tile_map_loader = tile_map_loader
 
+        # --- Rendering and Pygame Setup (rect is reused across lives) ---
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+        self.setup_enemy(spawn_x, spawn_y, archetype)
+
+    def reset(self, spawn_x, spawn_y, archetype=None):
+        """Reinitializes a pooled enemy in place for a new life at the spawn position."""
+        super().reset()
+        self.setup_enemy(spawn_x, spawn_y, archetype)
+
+    def setup_enemy(self, spawn_x, spawn_y, archetype=None):
+        """Initializes the per-life enemy state at the spawn position."""
+        self.archetype = archetype
+
         # --- Movement Stats ---
         self.move_speed = 1  # Enemy moves 1 tile per turn
+        self.action_speed = NORMAL_SPEED
 
-        # --- Rendering and Pygame Setup ---
-        self.image = self.tile_map_loader.get_tile(0)
-        self.original_image = self.image.copy()
-        self.rect = self.image.get_rect()
+        # --- Rendering ---
+        # The sprite is shared with every enemy of the same archetype, never modified in place
+        self.sprite_id = archetype.sprite_id if archetype is not None else 0
+        if archetype is not None:
+            self.image = archetype.sprite
+        else:
+            self.image = self.tile_map_loader.get_tile(0)
+        self.original_image = self.image
+        self.rect.size = self.image.get_size()
 
         # --- Logical Grid Position ---
         self.grid_x: int = spawn_x
@@ -48,6 +70,7 @@ class Enemy(Entity):
 
         # --- AI and Behavior ---
         self.view_radius: int = 5
+        self.ai_profile: str = "patrol"
         self.ai_state: str = "PATROL"
 
         # Patrol waypoints - enemy will pathfind to each in order
@@ -57,6 +80,18 @@ class Enemy(Entity):
         self.turn_timer: int = 0
         self.facing_dir: tuple[int, int] = (0, 0)
 
+        if archetype is not None:
+            self.apply_archetype(archetype)
+
+    def apply_archetype(self, archetype):
+        """Applies the stats and AI profile of an EnemyArchetype."""
+        self.max_health = archetype.max_health
+        self.current_health = archetype.max_health
+        self.move_speed = archetype.move_speed
+        self.action_speed = archetype.action_speed
+        self.view_radius = archetype.view_radius
+        self.ai_profile = archetype.ai_profile
+
     def can_see_player(self, player_grid_pos: tuple[int, int]) -> bool:
         """
         Checks if the player is within view_radius AND if there is a clear,
@@ -75,34 +110,8 @@ class Enemy(Entity):
         if distance > self.view_radius:
             return False
 
-        # --- Line of Sight (LOS) ---
-        step_x = 1 if player_x > current_x else -1
-        step_y = 1 if player_y > current_y else -1
-
-        err = dx - dy
-        level = GM.current_level
-
-        while current_x != player_x or current_y != player_y:
-            # --- Check the CURRENT tile (before stepping) ---
-            if current_x != self.grid_x or current_y != self.grid_y:
-                tile_id = level.get_tile_at(current_x, current_y)
-                walkable = Tile.get_walkable_tiles()
-                selectable = Tile.get_selectable_tiles()
-                if tile_id not in walkable and tile_id not in selectable and tile_id:
-                    return False
-
-            # --- Step toward the player using the error term ---
-            e2 = 2 * err
-
-            if e2 > -dy:
-                err -= dy
-                current_x += step_x
-
-            if e2 < dx:
-                err += dx
-                current_y += step_y
-
-        return True
+        # --- Line of Sight (LOS), shared with the fog of war ---
+        return GM.current_level.has_line_of_sight(self.grid_x, self.grid_y, player_x, player_y)
 
     def take_turn(self, player_grid_pos: tuple[int, int]):
         """
@@ -116,6 +125,16 @@ class Enemy(Entity):
             print(f"[ENEMY DEBUG] {self.__class__.__name__} at {self.get_grid_pos()} is still moving")
             return False
 
+        # --- Lookahead AI simulates a few turns ahead on a snapshot ---
+        if self.ai_profile == "lookahead":
+            return self._do_lookahead_turn(player_grid_pos)
+
+        # --- Squad AI reads shared perception from its region's blackboard ---
+        if self.ai_profile == "squad":
+            blackboard = GM.current_level.squads.get_blackboard(self)
+            if blackboard is not None:
+                return self._do_squad_turn(blackboard, player_grid_pos)
+
         # --- State Transition Check ---
         if self.can_see_player(player_grid_pos):
             self.ai_state = "CHASE"
@@ -134,6 +153,100 @@ class Enemy(Entity):
 
         return action_taken
 
+    def _do_squad_turn(self, blackboard, player_grid_pos: tuple[int, int]) -> bool:
+        """
+        Acts on the blackboard's shared perception. Members that know where the
+        player is chase, flank or hold according to their role; the others patrol.
+        Returns True if a move/attack was successfully executed.
+        """
+        squads = GM.current_level.squads
+        role = blackboard.get_role(self)
+
+        if role is None:
+            self.ai_state = "PATROL"
+            return self._do_patrol()
+
+        # --- Any engaged member next to the player attacks ---
+        player_x, player_y = player_grid_pos
+        if abs(player_x - self.grid_x) + abs(player_y - self.grid_y) == 1:
+            self.ai_state = "ATTACK"
+            return self._do_attack(player_grid_pos)
+
+        distance_to_player = squads.get_field(player_grid_pos).get(self.get_grid_pos())
+
+        if not blackboard.player_visible:
+            # --- Lost sight: converge on the last known position ---
+            goal = blackboard.last_known_player_pos
+            if goal is None or self.get_grid_pos() == goal:
+                blackboard.last_known_player_pos = None
+                self.ai_state = "PATROL"
+                return False
+            self.ai_state = "SEARCH"
+            next_step = squads.choose_step(self, goal)
+
+        elif role == ROLE_HOLD and distance_to_player is not None and distance_to_player <= HOLD_RANGE:
+            # --- Close enough: hold position and keep the exits covered ---
+            self.ai_state = "HOLD"
+            return False
+
+        elif role == ROLE_FLANK:
+            # --- Approach while keeping away from the chaser to close in from another side ---
+            self.ai_state = "FLANK"
+            chaser = squads.get_member_with_role(blackboard, ROLE_CHASE)
+            next_step = squads.choose_step(self, player_grid_pos, avoid=chaser.get_grid_pos() if chaser else None)
+
+        else:
+            self.ai_state = "CHASE"
+            next_step = squads.choose_step(self, player_grid_pos)
+
+        if next_step is None:
+            return False
+
+        self._step_to(next_step[0], next_step[1])
+        return True
+
+    def _do_lookahead_turn(self, player_grid_pos: tuple[int, int]) -> bool:
+        """
+        Picks an action with GM.lookahead_brain using a snapshot of the
+        surroundings within twice the view radius.
+        Falls back to patrolling while the player is out of sight.
+        """
+        if not self.can_see_player(player_grid_pos):
+            self.ai_state = "PATROL"
+            return self._do_patrol()
+
+        snapshot = GameSnapshot.from_level(
+            GM.current_level,
+            GM.player,
+            center=self.get_grid_pos(),
+            radius=self.view_radius * 2
+        )
+        kind, target = GM.lookahead_brain.choose_action(snapshot, self.entity_id)
+
+        if kind == ACTION_ATTACK:
+            self.ai_state = "ATTACK"
+            return self._do_attack(player_grid_pos)
+
+        if kind == ACTION_MOVE:
+            self.ai_state = "CHASE"
+            self._step_to(target[0], target[1])
+            return True
+
+        self.ai_state = "HOLD"
+        return False
+
+    def _step_to(self, target_x, target_y):
+        """Squashes in the direction of travel and moves one tile."""
+        if target_x - self.grid_x != 0:  # Horizontal movement
+            self.squash_y = 1.1
+            self.squash_x = 0.9
+        else:  # Vertical movement
+            self.squash_x = 1.1
+            self.squash_y = 0.9
+
+        GM.current_level.squads.move_occupant(self.get_grid_pos(), (target_x, target_y))
+        move_entity(self, target_x, target_y)
+
     def _do_chase(self, player_grid_pos: tuple[int, int]) -> bool:
         """
         Moves towards the player using pathfinding.
@@ -161,15 +274,7 @@ class Enemy(Entity):
 
             # Check if destination is walkable
             if GM.current_level.is_walkable(target_x, target_y):
-                # Determine squash direction
-                if target_x - self.grid_x != 0:  # Horizontal movement
-                    self.squash_y = 1.1
-                    self.squash_x = 0.9
-                else:  # Vertical movement
-                    self.squash_x = 1.1
-                    self.squash_y = 0.9
-
-                move_entity(self, target_x, target_y)
+                self._step_to(target_x, target_y)
                 return True
 
         return False
@@ -197,15 +302,7 @@ class Enemy(Entity):
             step_x, step_y = next_step
 
             if GM.current_level.is_walkable(step_x, step_y):
-                # Determine squash direction
-                if step_x - self.grid_x != 0:  # Horizontal movement
-                    self.squash_y = 1.1
-                    self.squash_x = 0.9
-                else:  # Vertical movement
-                    self.squash_x = 1.1
-                    self.squash_y = 0.9
-
-                move_entity(self, step_x, step_y)
+                self._step_to(step_x, step_y)
                 return True
 
         return False
@@ -244,7 +341,7 @@ class Enemy(Entity):
                 entity=self,
                 target_grid_x=retreat_x,
                 target_grid_y=retreat_y,
-                duration_frames=10,
+                duration=0.165,
                 on_complete_callback=retreat_complete_callback
             )
 
@@ -252,7 +349,7 @@ class Enemy(Entity):
             entity=self,
             target_grid_x=target_x,
             target_grid_y=target_y,
-            duration_frames=4,
+            duration=0.065,
             on_complete_callback=lunge_complete_callback
         )
 
@@ -293,7 +390,7 @@ class Enemy(Entity):
         # --- Only knockback if destination is walkable ---
         if can_knockback:
             print(f"[ENEMY DEBUG] Knocking back to ({new_x}, {new_y})")
-            move_entity(self, new_x, new_y, duration_frames=8, on_complete_callback=on_knockback_complete)
+            move_entity(self, new_x, new_y, duration=0.135, on_complete_callback=on_knockback_complete)
         else:
             print(f"[ENEMY DEBUG] Knockback blocked, staying at ({self.grid_x}, {self.grid_y})")
             # --- Still need to set is_moving and handle death ---
@@ -312,15 +409,13 @@ class Enemy(Entity):
             GM.death_cloud.burst(explosion_pos, num_particles=15 + particle_variation)
 
         self.is_alive = False
-        self.kill()
+        GM.current_level.despawn_enemy(self)
 
     def update(self):
         """
         Calculates the enemy's pixel position based on the animated slide
         relative to the map's current draw position.
         """
-        self.update_damage_flash()
-
         # --- Determine base position and slide offset ---
         if self.is_moving:
             base_grid_x = self.start_grid_x
@@ -330,9 +425,7 @@ class Enemy(Entity):
 
             # --- Apply squash & stretch while moving ---
             if self.squash_x != 1.0 or self.squash_y != 1.0:
-                new_width = int(self.original_image.get_width() * self.squash_x)
-                new_height = int(self.original_image.get_height() * self.squash_y)
-                self.image = pygame.transform.scale(self.original_image, (new_width, new_height))
+                self.image = self.get_sprite_variant()
         else:
             base_grid_x = self.grid_x
             base_grid_y = self.grid_y
@@ -343,12 +436,11 @@ class Enemy(Entity):
             if self.squash_x != 1.0 or self.squash_y != 1.0:
                 self.squash_x = 1.0
                 self.squash_y = 1.0
-                self.image = self.original_image.copy()
+                self.image = self.original_image
 
-        # --- Calculate screen position using current camera offset ---
-        screen_pos_x = (base_grid_x * GM.render_tile_size) + GM.current_level.offset_x
-        screen_pos_y = (base_grid_y * GM.render_tile_size) + GM.current_level.offset_y
+        # --- Calculate screen position using the (pixel-snapped) camera ---
+        screen_pos_x, screen_pos_y = GM.current_level.camera.grid_to_screen(base_grid_x, base_grid_y)
 
         # --- Add the slide offset ---
-        self.rect.x = round(screen_pos_x + slide_offset_x)
-        self.rect.y = round(screen_pos_y + slide_offset_y)
+        self.rect.x = screen_pos_x + round(slide_offset_x)
+        self.rect.y = screen_pos_y + round(slide_offset_y)
@@ -1,31 +1,84 @@
+from itertools import count
+
 import pygame
 
+from scripts.animation import FRAME_TIME
+from scripts.turn_scheduler import NORMAL_SPEED
+
 
 class Entity(pygame.sprite.Sprite):
+    # --- Source of stable, unique entity IDs ---
+    _next_entity_id = count(1)
 
     def __init__(self, tile_map_loader):
         super().__init__()
         self.tile_map_loader = tile_map_loader
+
+        # --- Movement Stats ---
+        self.move_speed = 1  # Number of tiles entity can move per turn
+        self.action_speed = NORMAL_SPEED  # How often the entity acts (see TurnScheduler)
+
+        # --- Damage Flash Effect ---
+        self.image = None
+        self.original_image = None
+        self.sprite_id = 0  # Tile index of the sprite, used to look up its cached variants
+        self.spatial_index = None  # SpatialIndex notified of grid moves (set by the index)
+        self.flash_duration = 0.35  # Total seconds to flash
+        self.flash_interval = 5 / 60  # Seconds between each flash toggle
+        self.flash_color = (255, 255, 255, 255)
+
+        self.setup_entity()
+
+    def setup_entity(self):
+        """
+        Initializes the per-life state shared by all entities.
+        Runs on creation and again whenever the entity is reset for reuse.
+        """
+        self.entity_id = next(Entity._next_entity_id)
+
         # --- Game Grid State  ---
         self.grid_x = 0
         self.grid_y = 0
         self.facing_dir = (0, 0)
 
-        # --- Movement Stats ---
-        self.move_speed = 1  # Number of tiles entity can move per turn
-
         # These properties will be animated by EntityActions.move_entity
         self.offset_x_visual = float(self.grid_x)
         self.offset_y_visual = float(self.grid_y)
 
-        # --- Damage Flash Effect ---
-        self.image = None
-        self.original_image = None
+        # --- Damage Flash State ---
         self.is_flashing = False
-        self.flash_timer = 0
-        self.flash_duration = 21  # Total frames to flash
-        self.flash_interval = 5  # Frames between each flash toggle
-        self.flash_color = (255, 255, 255, 255)
+        self.flash_timer = 0.0
+        if self.original_image is not None:
+            self.image = self.original_image
+
+    # --- Grid position (reported to the spatial index on change) ---
+
+    @property
+    def grid_x(self):
+        return self._grid_x
+
+    @grid_x.setter
+    def grid_x(self, value):
+        self._grid_x = value
+        if self.spatial_index is not None:
+            self.spatial_index.update(self)
+
+    @property
+    def grid_y(self):
+        return self._grid_y
+
+    @grid_y.setter
+    def grid_y(self, value):
+        self._grid_y = value
+        if self.spatial_index is not None:
+            self.spatial_index.update(self)
+
+    def reset(self):
+        """
+        Reset hook used by EntityPool to reinitialize a despawned entity in place.
+        Subclasses extend this with their own spawn parameters.
+        """
+        self.setup_entity()
 
     def get_grid_pos(self):
         """Returns the player's position in the map grid."""
@@ -47,53 +100,45 @@ class Entity(pygame.sprite.Sprite):
     def start_damage_flash(self):
         """Initiates the damage flash effect."""
         self.is_flashing = True
-        self.flash_timer = 0
+        self.flash_timer = 0.0
 
-    def update_damage_flash(self):
+    def update_damage_flash(self, dt=FRAME_TIME):
         """
-        Updates the damage flash effect.
+        Advances the damage flash effect by dt seconds.
         Should be called in the entity's update() method.
         Requires self.original_image to be set.
         """
         if not self.is_flashing:
             return
 
-        self.flash_timer += 1
+        self.flash_timer += dt
 
         # --- Determine if we should show the flash or normal sprite ---
-        flash_cycle = (self.flash_timer // self.flash_interval) % 2
+        flash_cycle = int(self.flash_timer / self.flash_interval) % 2
 
         if flash_cycle == 1:
-            mask = pygame.mask.from_surface(self.original_image)
-            flash_image = mask.to_surface(setcolor=self.flash_color, unsetcolor=(0, 0, 0, 0))
-
-            # 3. Apply squash (copy-pasted from your existing logic)
-            if hasattr(self, 'squash_x') and hasattr(self, 'squash_y'):
-                if self.squash_x != 1.0 or self.squash_y != 1.0:
-                    new_width = int(flash_image.get_width() * self.squash_x)
-                    new_height = int(flash_image.get_height() * self.squash_y)
-                    self.image = pygame.transform.scale(flash_image, (new_width, new_height))
-                else:
-                    self.image = flash_image
-            else:
-                self.image = flash_image
+            self.image = self.get_sprite_variant(silhouette=self.flash_color)
         else:
             # --- Show normal sprite ---
-            if hasattr(self, 'squash_x') and hasattr(self, 'squash_y'):
-                if self.squash_x != 1.0 or self.squash_y != 1.0:
-                    new_width = int(self.original_image.get_width() * self.squash_x)
-                    new_height = int(self.original_image.get_height() * self.squash_y)
-                    self.image = pygame.transform.scale(self.original_image, (new_width, new_height))
-                else:
-                    self.image = self.original_image.copy()
-            else:
-                self.image = self.original_image.copy()
+            self.image = self.get_sprite_variant()
 
         # --- End flash effect after duration ---
         if self.flash_timer >= self.flash_duration:
-            self.is_flashing = False
-            self.flash_timer = 0
-            self.image = self.original_image.copy()
+            self.stop_damage_flash()
+
+    def stop_damage_flash(self):
+        """Ends the damage flash effect and restores the normal sprite."""
+        self.is_flashing = False
+        self.flash_timer = 0.0
+        self.image = self.original_image
+
+    def get_sprite_variant(self, silhouette=None):
+        """
+        Returns the sprite with the current squash/stretch applied (and filled
+        with the silhouette colour, if given), from the sprite sheet's variant cache.
+        """
+        scale = (getattr(self, 'squash_x', 1.0), getattr(self, 'squash_y', 1.0))
+        return self.tile_map_loader.get_variant(self.sprite_id, scale, silhouette=silhouette)
 
     def perform_queued_action(self):
         """
@@ -1,5 +1,6 @@
 import pygame
 
+from scripts.batch_tween import EASE_OUT_QUAD
 from scripts.entityClasses.entity import Entity
 from scripts.entity_actions import move_player_path, move_player
 from scripts.game_manager import GM
@@ -21,8 +22,9 @@ class Player(Entity):
         self.move_speed = 3
 
         # --- Sprite Setup ---
-        self.image = self.tile_map_loader.get_tile(Tile.PLAYER_CHARACTER.value)
-        self.original_image = self.image.copy()
+        self.sprite_id = Tile.PLAYER_CHARACTER.value
+        self.image = self.tile_map_loader.get_tile(self.sprite_id)
+        self.original_image = self.image
         self.rect = self.image.get_rect()
 
         self.selector = self.tile_map_loader.get_tile(Tile.SELECTOR.value)
@@ -63,11 +65,17 @@ class Player(Entity):
 
         self.highlight_outline = pygame.Surface((GM.render_tile_size, GM.render_tile_size), pygame.SRCALPHA)
         pygame.draw.rect(self.highlight_outline, self.COLOUR_BLUE_DARK,
-                         (0, 0, GM.render_tile_size, GM.render_tile_size), 2)
+                         (0, 0, GM.render_tile_size, GM.render_tile_size), GM.sprite_scale)
+
+        # --- Movement range overlay (pre-rendered once per movement phase) ---
+        self.range_surface = None  # Every reachable tile's fill and outline
+        self.range_rings = []  # (distance, tile rects in range_surface), nearest ring first
+        self.range_origin = (0, 0)  # World pixel position of range_surface
+        self.range_max_distance = 1
 
         # --- Movement range animation ---
         self.range_reveal_progress = 0.0
-        self.range_reveal_speed = 0.15
+        self.range_reveal_speed = 9.0  # Progress per second
 
     def set_grid_pos(self, x, y):
         """Sets the player's starting position in the map grid."""
@@ -91,6 +99,7 @@ class Player(Entity):
         )
         self.movement_confirmed = False
         self.range_reveal_progress = 0.0
+        self.build_range_rings()
         print(f"[PLAYER] Movement phase started. Reachable tiles: {len(self.reachable_tiles)}")
 
     def move_cursor(self, dx, dy):
@@ -216,58 +225,81 @@ class Player(Entity):
         print("[PLAYER] No valid action in that direction")
         return False
 
-    def draw_movement_range(self, surface):
-        """Draw highlighted tiles showing movement range with grow-out effect."""
-        if not self.reachable_tiles:
-            return
-
-        # --- Update reveal animation ---
-        if self.range_reveal_progress < 1.0:
-            self.range_reveal_progress = min(1.0, self.range_reveal_progress + self.range_reveal_speed)
+    def build_range_rings(self):
+        """
+        Pre-renders the movement range once per movement phase into one
+        surface, and groups its tiles into rings at the same distance from
+        the player. Once the range has grown out it is drawn with one blit;
+        while growing, only the tiles of the revealed rings are blitted.
+        """
+        self.range_surface = None
+        self.range_rings = []
 
-        # --- Calculate distances for reveal effect ---
-        tile_distances = {}
+        # --- Group tiles by distance for the reveal effect ---
+        rings = {}
         for tile_x, tile_y in self.reachable_tiles:
             if tile_x == self.grid_x and tile_y == self.grid_y:
                 continue
             distance = abs(tile_x - self.grid_x) + abs(tile_y - self.grid_y)
-            tile_distances[(tile_x, tile_y)] = distance
+            rings.setdefault(distance, []).append((tile_x, tile_y))
 
-        max_distance = max(tile_distances.values()) if tile_distances else 1
-        revealed_distance = max_distance * self.range_reveal_progress
+        if not rings:
+            self.range_max_distance = 1
+            return
 
-        # --- Draw tiles ---
-        for tile_x, tile_y in self.reachable_tiles:
-            if tile_x == self.grid_x and tile_y == self.grid_y:
-                continue
+        # --- The range surface covers the bounding box of the whole range ---
+        tile_size = GM.render_tile_size
+        tiles = [tile for ring in rings.values() for tile in ring]
+        min_x = min(tile_x for tile_x, _ in tiles)
+        min_y = min(tile_y for _, tile_y in tiles)
+        width = (max(tile_x for tile_x, _ in tiles) - min_x + 1) * tile_size
+        height = (max(tile_y for _, tile_y in tiles) - min_y + 1) * tile_size
+        self.range_origin = (min_x * tile_size, min_y * tile_size)
+        self.range_max_distance = max(rings)
+
+        self.range_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        for distance in sorted(rings):
+            tile_rects = [pygame.Rect((tile_x - min_x) * tile_size, (tile_y - min_y) * tile_size,
+                                      tile_size, tile_size)
+                          for tile_x, tile_y in rings[distance]]
+            self.range_surface.blits([(self.highlight_surf, rect) for rect in tile_rects], doreturn=0)
+            self.range_surface.blits([(self.highlight_outline, rect) for rect in tile_rects], doreturn=0)
+            self.range_rings.append((distance, tile_rects))
+
+    def update_range_reveal(self, dt):
+        """Advances the movement range's grow-out effect by dt seconds."""
+        if self.range_reveal_progress < 1.0:
+            self.range_reveal_progress = min(1.0, self.range_reveal_progress + self.range_reveal_speed * dt)
 
-            distance = tile_distances.get((tile_x, tile_y), 0)
-            if distance > revealed_distance:
-                continue
+    def draw_movement_range(self, surface):
+        """Draw highlighted tiles showing movement range with grow-out effect."""
+        if not self.range_rings:
+            return
 
-            screen_x = (tile_x * GM.render_tile_size) + GM.current_level.offset_x
-            screen_y = (tile_y * GM.render_tile_size) + GM.current_level.offset_y
+        screen_x, screen_y = GM.current_level.camera.world_to_screen(*self.range_origin)
+        if self.range_reveal_progress >= 1.0:
+            surface.blit(self.range_surface, (screen_x, screen_y))
+            return
 
-            # --- Draw fill ---
-            surface.blit(self.highlight_surf, (screen_x, screen_y))
-            # --- Draw outline ---
-            surface.blit(self.highlight_outline, (screen_x, screen_y))
+        # --- Growing out: draw the tiles of the revealed rings only ---
+        revealed_distance = self.range_max_distance * self.range_reveal_progress
+        blits = []
+        for distance, tile_rects in self.range_rings:
+            if distance > revealed_distance:
+                break
+            blits.extend((self.range_surface, (screen_x + rect.x, screen_y + rect.y), rect) for rect in tile_rects)
+        surface.blits(blits, doreturn=0)
 
     def draw_movement_cursor(self, surface):
         """Draw the cursor showing where player will move."""
         if self.cursor_x != self.grid_x or self.cursor_y != self.grid_y:
-            screen_x = (self.cursor_x * GM.render_tile_size) + GM.current_level.offset_x
-            screen_y = (self.cursor_y * GM.render_tile_size) + GM.current_level.offset_y
+            screen_x, screen_y = GM.current_level.camera.grid_to_screen(self.cursor_x, self.cursor_y)
 
-            cursor_colored = self.selector.copy()
-            cursor_colored.fill((255, 255, 255, 255), special_flags=pygame.BLEND_MULT)
-            surface.blit(cursor_colored, (screen_x, screen_y))
+            surface.blit(self.selector, (screen_x, screen_y))
 
     def get_colored_selector(self, colour):
-        """Creates a temporary, colored version of the selector sprite."""
-        colored_selector = self.selector.copy()
-        colored_selector.fill(colour, special_flags=pygame.BLEND_MULT)
-        return colored_selector
+        """Returns a colored version of the selector sprite (cached by the sprite sheet)."""
+        return self.tile_map_loader.get_variant(Tile.SELECTOR.value, tint=colour)
 
     def draw_action_selector(self, surface):
         """Draw the selector for action phase."""
@@ -278,8 +310,7 @@ class Player(Entity):
         target_x = self.grid_x + dx
         target_y = self.grid_y + dy
 
-        screen_x = (target_x * GM.render_tile_size) + GM.current_level.offset_x
-        screen_y = (target_y * GM.render_tile_size) + GM.current_level.offset_y
+        screen_x, screen_y = GM.current_level.camera.grid_to_screen(target_x, target_y)
 
         target_tile_index = GM.current_level.get_tile_at(target_x, target_y)
 
@@ -309,22 +340,14 @@ class Player(Entity):
 
         # --- Move player without triggering state transition ---
         if suppress_state_transition:
-            # Manually create the animation without calling move_player
-            from scripts.animation import InterpolationAnimation
-
+            # Manually create the tween without calling move_player
             start_visual_x = self.offset_x_visual
             start_visual_y = self.offset_y_visual
 
             # --- DON'T update grid position yet ---
             self.is_moving = True
 
-            duration_frames = 8
-
-            # Calculate camera target
-            player_pixel_x = new_x * GM.render_tile_size
-            player_pixel_y = new_y * GM.render_tile_size
-            target_offset_x = GM.screen_width // 2 - player_pixel_x - (GM.render_tile_size // 2)
-            target_offset_y = GM.screen_height // 2 - player_pixel_y - (GM.render_tile_size // 2)
+            duration = 0.135
 
             def on_movement_complete():
                 # --- Update grid position NOW ---
@@ -334,38 +357,25 @@ class Player(Entity):
                 self.is_moving = False
 
             # --- Animate visual offset ---
-            player_visual_x_anim = InterpolationAnimation(
-                target_object=self,
-                property_name='offset_x_visual',
-                start_value=start_visual_x,
-                end_value=float(new_x),
-                duration_frames=duration_frames,
-                easing_function=InterpolationAnimation.ease_out_quad,
+            GM.add_tween(
+                target=self,
+                attributes=('offset_x_visual', 'offset_y_visual'),
+                start_value=(start_visual_x, start_visual_y),
+                end_value=(float(new_x), float(new_y)),
+                duration=duration,
+                easing=EASE_OUT_QUAD,
                 on_complete_callback=on_movement_complete
             )
 
-            player_visual_y_anim = InterpolationAnimation(
-                target_object=self,
-                property_name='offset_y_visual',
-                start_value=start_visual_y,
-                end_value=float(new_y),
-                duration_frames=duration_frames,
-                easing_function=InterpolationAnimation.ease_out_quad
-            )
-
             # --- Animate camera ---
-            GM.current_level.animate_camera_to(target_offset_x, target_offset_y, duration_frames=duration_frames)
-
-            # Add animations
-            GM.add_animation(player_visual_x_anim)
-            GM.add_animation(player_visual_y_anim)
+            GM.current_level.camera.pan_to_tile(new_x, new_y, duration=duration)
         else:
             # Normal player turn damage - use move_player
             def on_damage_complete():
                 self.sync_visual_offset()
                 self.is_moving = False
 
-            move_player(self, new_x, new_y, duration_frames=8, on_complete_callback=on_damage_complete)
+            move_player(self, new_x, new_y, duration=0.135, on_complete_callback=on_damage_complete)
 
         self.start_damage_flash()
         GM.hud_manager.update_health(self.current_health)
@@ -375,37 +385,27 @@ class Player(Entity):
 
     def update(self):
         """Update player's visual position based on animated offset."""
-        center_x = GM.screen_width // 2
-        center_y = GM.screen_height // 2
-
-        self.update_damage_flash()
+        center_x, center_y = GM.current_level.camera.screen_center
 
         # Update image for squash/stretch effect
         if not self.is_flashing:
             if self.is_moving and (self.squash_x != 1.0 or self.squash_y != 1.0):
-                new_width = int(self.original_image.get_width() * self.squash_x)
-                new_height = int(self.original_image.get_height() * self.squash_y)
-                self.image = pygame.transform.scale(self.original_image, (new_width, new_height))
+                self.image = self.get_sprite_variant()
             elif not self.is_moving:
-                self.image = self.original_image.copy()
+                self.image = self.original_image
 
         # Calculate pixel offset from visual animation
         # The player stays visually centered, while offset_x_visual tracks logical position
         pixel_offset_x = (self.offset_x_visual - float(self.grid_x)) * GM.render_tile_size
         pixel_offset_y = (self.offset_y_visual - float(self.grid_y)) * GM.render_tile_size
 
-        # Player stays centered on screen
-        self.rect = self.image.get_rect()
+        # Player stays centered on screen (the rect is resized in place, not rebuilt)
+        self.rect.size = self.image.get_size()
         self.rect.centerx = center_x + pixel_offset_x
         self.rect.centery = center_y + pixel_offset_y
 
-        if self.is_moving:
-            if self.is_moving:
-                print(
-                    f"grid=({self.grid_x},{self.grid_y}), offset=({self.offset_x_visual:.3f},{self.offset_y_visual:.3f}),"
-                    f" pixel=({pixel_offset_x:.1f},{pixel_offset_y:.1f})")
-
     @staticmethod
     def game_over():
-        if GM.state_machine:
+        # --- Several enemies may land a killing blow in the same phase ---
+        if GM.state_machine and GM.state_machine.current_state.id != "game_over":
             GM.state_machine.game_over_transition()
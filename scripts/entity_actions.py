@@ -2,11 +2,11 @@
 Handles all entity-based actions and animations like movement and attacks
 """
 
-from scripts.animation import InterpolationAnimation
+from scripts.batch_tween import EASE_OUT_QUAD, EASE_IN_OUT_QUAD
 from scripts.game_manager import GM
 
 
-def move_player(player, new_grid_x, new_grid_y, duration_frames=12, on_complete_callback=None):
+def move_player(player, new_grid_x, new_grid_y, duration=0.2, on_complete_callback=None):
     """
     Locks the game and smoothly animates the camera to center on the
     player's new grid position. This is the official move action for the Player.
@@ -15,7 +15,7 @@ def move_player(player, new_grid_x, new_grid_y, duration_frames=12, on_complete_
         player: The Player object instance.
         new_grid_x: The player's new X grid position.
         new_grid_y: The player's new Y grid position.
-        duration_frames: Animation duration for the camera pan.
+        duration: Animation duration for the camera pan, in seconds.
         on_complete_callback: Optional callback function to call when animation completes.
     """
     # --- Use CURRENT visual offset as starting point ---
@@ -25,12 +25,6 @@ def move_player(player, new_grid_x, new_grid_y, duration_frames=12, on_complete_
     # --- DON'T update grid position yet - wait for animation to complete ---
     player.is_moving = True
 
-    # --- Calculate camera target ---
-    player_pixel_x = new_grid_x * GM.render_tile_size
-    player_pixel_y = new_grid_y * GM.render_tile_size
-    target_offset_x = GM.screen_width // 2 - player_pixel_x - (GM.render_tile_size // 2)
-    target_offset_y = GM.screen_height // 2 - player_pixel_y - (GM.render_tile_size // 2)
-
     # --- Animation complete callback ---
     def on_movement_complete():
         # --- Explicitly set final values to avoid any floating point drift ---
@@ -43,36 +37,21 @@ def move_player(player, new_grid_x, new_grid_y, duration_frames=12, on_complete_
             on_complete_callback()
 
     # --- Animate visual offset (for sprite sliding) ---
-    player_visual_x_anim = InterpolationAnimation(
-        target_object=player,
-        property_name='offset_x_visual',
-        start_value=start_visual_x,
-        end_value=float(new_grid_x),
-        duration_frames=duration_frames,
-        easing_function=InterpolationAnimation.ease_out_quad,
+    GM.add_tween(
+        target=player,
+        attributes=('offset_x_visual', 'offset_y_visual'),
+        start_value=(start_visual_x, start_visual_y),
+        end_value=(float(new_grid_x), float(new_grid_y)),
+        duration=duration,
+        easing=EASE_OUT_QUAD,
         on_complete_callback=on_movement_complete
     )
 
-    player_visual_y_anim = InterpolationAnimation(
-        target_object=player,
-        property_name='offset_y_visual',
-        start_value=start_visual_y,
-        end_value=float(new_grid_y),
-        duration_frames=duration_frames,
-        easing_function=InterpolationAnimation.ease_out_quad
-    )
-
     # --- Animate camera (for world scrolling) ---
-    GM.current_level.animate_camera_to(target_offset_x, target_offset_y, duration_frames=duration_frames)
-
-    # --- Add player visual animations ---
-    GM.add_animation(player_visual_x_anim)
-    GM.add_animation(player_visual_y_anim)
-
-    return player_visual_x_anim
+    GM.current_level.camera.pan_to_tile(new_grid_x, new_grid_y, duration=duration)
 
 
-def move_entity(entity, target_grid_x, target_grid_y, duration_frames=12, on_complete_callback=None):
+def move_entity(entity, target_grid_x, target_grid_y, duration=0.2, on_complete_callback=None):
     """
     Smoothly animates an entity from current grid position to target grid position
     by animating the internal slide properties.
@@ -115,42 +94,27 @@ def move_entity(entity, target_grid_x, target_grid_y, duration_frames=12, on_com
         if on_complete_callback:
             on_complete_callback()
 
-    # --- Create Slide Animation ---
-    offset_x_animation = InterpolationAnimation(
-        target_object=entity,
-        property_name='slide_x',
-        start_value=0.0,
-        end_value=float(slide_dx),
-        duration_frames=duration_frames,
-        easing_function=InterpolationAnimation.ease_in_out_quad,
+    # --- Create Slide Tween ---
+    GM.add_tween(
+        target=entity,
+        attributes=('slide_x', 'slide_y'),
+        start_value=(0.0, 0.0),
+        end_value=(float(slide_dx), float(slide_dy)),
+        duration=duration,
+        easing=EASE_IN_OUT_QUAD,
         on_complete_callback=finalize_move
     )
 
-    offset_y_animation = InterpolationAnimation(
-        target_object=entity,
-        property_name='slide_y',
-        start_value=0.0,
-        end_value=float(slide_dy),
-        duration_frames=duration_frames,
-        easing_function=InterpolationAnimation.ease_in_out_quad
-    )
-
-    # --- Execute ---
-    GM.add_animation(offset_x_animation)
-    GM.add_animation(offset_y_animation)
-
-    return offset_x_animation
-
 
-def move_player_path(player, path, duration_per_tile=8, delay_between_steps=6, on_complete_callback=None):
+def move_player_path(player, path, duration_per_tile=0.135, delay_between_steps=0.1, on_complete_callback=None):
     """
     Moves the player along a path, animating each step sequentially.
 
     Args:
         player: The Player object instance.
         path: List of (x, y) tuples representing the path to follow.
-        duration_per_tile: Animation duration for each tile movement.
-        delay_between_steps: Frames to wait between steps (for unsquish).
+        duration_per_tile: Animation duration for each tile movement, in seconds.
+        delay_between_steps: Seconds to wait between steps (for unsquish).
         on_complete_callback: Optional callback function to call when all movement completes.
     """
     if not path or len(path) <= 1:
@@ -190,19 +154,17 @@ def move_player_path(player, path, duration_per_tile=8, delay_between_steps=6, o
             player.squash_y = 1.0
 
             # --- Ensure at least 2 frames of delay to render at exact position ---
-            actual_delay = max(2, delay_between_steps)  # Minimum 2 frames
+            actual_delay = max(2 / 60, delay_between_steps)  # Minimum 2 frames at 60 FPS
 
-            # --- Use the new DelayAnimation class ---
-            from scripts.animation import DelayAnimation
-            delay_anim = DelayAnimation(actual_delay, move_next_step)
-            GM.add_animation(delay_anim)
+            # --- Wait on the timer wheel (keeps the game locked until the next step) ---
+            GM.schedule(actual_delay, move_next_step)
 
         # --- Move to next tile ---
         move_player(
             player=player,
             new_grid_x=next_x,
             new_grid_y=next_y,
-            duration_frames=duration_per_tile,
+            duration=duration_per_tile,
             on_complete_callback=on_step_complete
         )
 
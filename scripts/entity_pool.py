@@ -0,0 +1,81 @@
+"""
+Pooled allocation of entities for spawning and despawning
+"""
+
+
+class EntityPool:
+    """
+    Keeps despawned entities on per-class free lists and reinitializes them
+    in place (via Entity.reset) instead of building new objects and surfaces.
+    """
+
+    def __init__(self):
+        self._free: dict[type, list] = {}
+        self._free_ids: set[int] = set()  # id() of every entity sitting in a free list
+
+        # --- Stats ---
+        self.hits = 0  # Acquires served from a free list
+        self.misses = 0  # Acquires that had to construct a new entity
+        self.releases = 0
+        self.live_count = 0
+        self.peak_live_count = 0
+
+    def acquire(self, entity_class, tile_map_loader, **spawn_kwargs):
+        """
+        Returns an entity of entity_class, reusing a despawned one if available.
+
+        Args:
+            entity_class: The Entity subclass to acquire.
+            tile_map_loader: SpriteSheet passed to the constructor for new entities.
+            **spawn_kwargs: Spawn parameters passed to the constructor or to reset().
+        """
+        free_list = self._free.get(entity_class)
+
+        if free_list:
+            entity = free_list.pop()
+            self._free_ids.discard(id(entity))
+            entity.reset(**spawn_kwargs)
+            self.hits += 1
+        else:
+            entity = entity_class(tile_map_loader, **spawn_kwargs)
+            self.misses += 1
+
+        self.live_count += 1
+        self.peak_live_count = max(self.peak_live_count, self.live_count)
+        return entity
+
+    def release(self, entity):
+        """Removes the entity from all sprite groups and returns it to its free list."""
+        if id(entity) in self._free_ids:
+            return
+
+        entity.kill()
+        self._free.setdefault(type(entity), []).append(entity)
+        self._free_ids.add(id(entity))
+
+        self.releases += 1
+        self.live_count = max(0, self.live_count - 1)
+
+    def free_count(self, entity_class=None):
+        """Returns the number of pooled entities, optionally for one class only."""
+        if entity_class is not None:
+            return len(self._free.get(entity_class, ()))
+        return len(self._free_ids)
+
+    def clear(self):
+        """Drops every pooled entity (e.g. when leaving a level)."""
+        self._free.clear()
+        self._free_ids.clear()
+
+    def get_stats(self):
+        """Returns a snapshot of the pool counters."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'releases': self.releases,
+            'live': self.live_count,
+            'peak_live': self.peak_live_count,
+            'free': len(self._free_ids),
+        }
@@ -0,0 +1,179 @@
+"""
+Fog of war and minimap, driven by per-level explored/visible cell bitmaps
+that are updated incrementally from the player's field of view.
+"""
+import numpy as np
+import pygame
+
+from scripts.game_manager import GM
+from scripts.tileset import Tile
+
+# --- Tuning ---
+VIEW_RADIUS = 6  # Tiles the player can see
+UNEXPLORED_ALPHA = 255  # Fog over cells never seen
+REMEMBERED_ALPHA = 150  # Fog over explored cells out of view
+MINIMAP_CELL_SIZE = 2  # Minimap pixels per tile (in source sprite pixels)
+
+# --- Minimap colours ---
+MINIMAP_BACKGROUND = (0, 0, 0, 160)
+MINIMAP_FLOOR = (110, 110, 130, 255)
+MINIMAP_WALL = (55, 55, 75, 255)
+MINIMAP_INTERACTIVE = (210, 170, 60, 255)
+MINIMAP_PLAYER = (90, 220, 90, 255)
+
+
+class FogOfWar:
+    """
+    Tracks which cells of a level have been explored and which are
+    visible right now, as NumPy bool bitmaps.
+
+    When the player moves (or the terrain changes, e.g. a door opens),
+    the field of view is recomputed and only the cells whose visibility
+    changed are repainted on the fog surface; cells explored for the first
+    time are painted onto the minimap one by one. Neither surface is ever
+    re-rendered in full.
+
+    The fog surface holds one pixel per cell, so its size does not depend
+    on the tile size. Only the part of it on screen is scaled up to tiles,
+    into a reused view surface, and only when the fog or the visible cells
+    change.
+    """
+
+    def __init__(self, level, view_radius=VIEW_RADIUS):
+        self.level = level
+        self.view_radius = view_radius
+        self.height = len(level.terrain_data)
+        self.width = len(level.terrain_data[0]) if self.height else 0
+
+        # --- Cell bitmaps ([row, column]) ---
+        self.explored = np.zeros((self.height, self.width), dtype=bool)
+        self.visible = np.zeros((self.height, self.width), dtype=bool)
+        self._viewer = None  # Grid position the visibility was computed from
+        self._stale = True  # Terrain changed since then
+
+        # --- Fog surface (one pixel per cell), starts fully unexplored ---
+        self.tile_size = GM.render_tile_size
+        self.fog_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.fog_surface.fill((0, 0, 0, UNEXPLORED_ALPHA))
+        self.fog_version = 0  # Bumped whenever a cell is repainted
+        self.changed_rects: list[pygame.Rect] = []  # Fog regions (world pixels) repainted since pop_changed_rects()
+
+        # --- On-screen part of the fog, scaled to tile size (see draw) ---
+        self._view_surface = None  # Grows to the largest view needed, reused in between
+        self._view_key = None  # (visible cells, fog_version) it was scaled for
+
+        # --- Minimap ---
+        self.minimap_cell_size = MINIMAP_CELL_SIZE * GM.sprite_scale
+        self.minimap_surface = pygame.Surface((self.width * self.minimap_cell_size,
+                                               self.height * self.minimap_cell_size), pygame.SRCALPHA)
+        self.minimap_surface.fill(MINIMAP_BACKGROUND)
+        self.minimap_marker = pygame.Surface((self.minimap_cell_size, self.minimap_cell_size))
+        self.minimap_marker.fill(MINIMAP_PLAYER)
+        self.minimap_changed = True  # Minimap patched since it was last drawn
+
+    # --- Visibility ---
+
+    def update(self, grid_x, grid_y):
+        """Recomputes the field of view if the viewer moved or the terrain changed."""
+        if not self._stale and self._viewer == (grid_x, grid_y):
+            return
+        self._viewer = (grid_x, grid_y)
+        self._stale = False
+
+        visible = self.compute_visible(grid_x, grid_y)
+
+        # --- Repaint the fog only where visibility changed ---
+        for row, col in np.argwhere(visible != self.visible).tolist():
+            self._paint_fog(col, row, visible[row, col])
+
+        # --- Patch newly explored cells into the minimap ---
+        for row, col in np.argwhere(visible & ~self.explored).tolist():
+            self._paint_minimap(col, row)
+
+        self.explored |= visible
+        self.visible = visible
+
+    def compute_visible(self, grid_x, grid_y):
+        """Returns the bitmap of cells within view radius and line of sight of (grid_x, grid_y)."""
+        visible = np.zeros((self.height, self.width), dtype=bool)
+        radius = self.view_radius
+        reach = radius * radius + radius  # Rounder edge than radius^2
+
+        for row in range(max(0, grid_y - radius), min(self.height, grid_y + radius + 1)):
+            for col in range(max(0, grid_x - radius), min(self.width, grid_x + radius + 1)):
+                if (col - grid_x) ** 2 + (row - grid_y) ** 2 > reach:
+                    continue
+                if self.level.has_line_of_sight(grid_x, grid_y, col, row):
+                    visible[row, col] = True
+        return visible
+
+    def on_tile_changed(self, grid_x, grid_y):
+        """Terrain changed: recompute the view on the next update, refresh the minimap cell."""
+        self._stale = True
+        if 0 <= grid_y < self.height and 0 <= grid_x < self.width and self.explored[grid_y, grid_x]:
+            self._paint_minimap(grid_x, grid_y)
+
+    def is_visible(self, grid_x, grid_y):
+        """Returns whether a cell is currently in the player's view."""
+        return 0 <= grid_y < self.height and 0 <= grid_x < self.width and bool(self.visible[grid_y, grid_x])
+
+    # --- Painting ---
+
+    def _paint_fog(self, grid_x, grid_y, is_visible):
+        alpha = 0 if is_visible else REMEMBERED_ALPHA
+        self.fog_surface.set_at((grid_x, grid_y), (0, 0, 0, alpha))
+        self.fog_version += 1
+        self.changed_rects.append(pygame.Rect(grid_x * self.tile_size, grid_y * self.tile_size,
+                                              self.tile_size, self.tile_size))
+
+    def _paint_minimap(self, grid_x, grid_y):
+        tile_id = self.level.get_tile_at(grid_x, grid_y)
+        if tile_id in Tile.get_walkable_tiles():
+            colour = MINIMAP_FLOOR
+        elif tile_id in Tile.get_selectable_tiles():
+            colour = MINIMAP_INTERACTIVE
+        elif tile_id != Tile.EMPTY.value:
+            colour = MINIMAP_WALL
+        else:
+            return
+
+        cell = self.minimap_cell_size
+        self.minimap_surface.fill(colour, (grid_x * cell, grid_y * cell, cell, cell))
+        self.minimap_changed = True
+
+    def pop_changed_rects(self):
+        """Returns and clears the fog regions (world pixels) repainted since the last call."""
+        rects = self.changed_rects
+        self.changed_rects = []
+        return rects
+
+    # --- Drawing ---
+
+    def draw(self, surface):
+        """Draws the fog over the cells on screen at the current camera position."""
+        camera = self.level.camera
+        min_x, min_y, max_x, max_y = camera.visible_tile_bounds(margin=0)
+        cells = pygame.Rect(min_x, min_y, max_x - min_x + 1, max_y - min_y + 1).clip(self.fog_surface.get_rect())
+        if not cells.width or not cells.height:
+            return
+
+        view_size = (cells.width * self.tile_size, cells.height * self.tile_size)
+        view_key = (tuple(cells), self.fog_version)
+        if view_key != self._view_key:
+            if self._view_surface is None or self._view_surface.get_width() < view_size[0] \
+                    or self._view_surface.get_height() < view_size[1]:
+                self._view_surface = pygame.Surface(view_size, pygame.SRCALPHA)
+            view = self._view_surface.subsurface((0, 0), view_size)
+            pygame.transform.scale(self.fog_surface.subsurface(cells), view_size, view)
+            self._view_key = view_key
+
+        surface.blit(self._view_surface, camera.grid_to_screen(cells.x, cells.y), ((0, 0), view_size))
+
+    def draw_minimap(self, surface, topleft, player_grid_pos):
+        """Draws the minimap with the player marker. Returns the minimap's screen rect."""
+        surface.blit(self.minimap_surface, topleft)
+        cell = self.minimap_cell_size
+        surface.blit(self.minimap_marker, (topleft[0] + player_grid_pos[0] * cell,
+                                           topleft[1] + player_grid_pos[1] * cell))
+        self.minimap_changed = False
+        return self.minimap_surface.get_rect(topleft=topleft)
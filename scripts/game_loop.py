@@ -0,0 +1,193 @@
+"""
+Fixed-timestep game loop with a registry of per-state handlers
+"""
+import math
+from sys import exit
+
+import pygame
+
+from scripts.game_manager import GM
+
+
+class StateHandler:
+    """
+    Base class for the logic and drawing of one GameState state.
+    Subclasses override the hooks they need.
+    """
+
+    def accepts_input(self):
+        """Returns whether events should be read this step (unread events stay queued)."""
+        return True
+
+    def is_idle(self):
+        """
+        Returns whether the state is only waiting for input: nothing moves,
+        so the loop may sleep and skip redraws until an event arrives.
+        """
+        return True
+
+    def handle_event(self, event):
+        """Handles one pygame event (QUIT is handled by the loop)."""
+        pass
+
+    def update(self, dt):
+        """Advances the state's logic by one fixed step of dt seconds."""
+        pass
+
+    def draw(self, surface):
+        """
+        Draws the state. May run more or less often than update().
+        Returns the list of screen rectangles that changed, or None if the
+        whole screen should be updated.
+        """
+        return None
+
+
+class GameLoop:
+    """
+    Runs the game logic at a fixed tick rate and renders as often as the
+    frame rate cap allows.
+
+    Real frame time is accumulated (scaled by GM.time_scale) and spent in
+    fixed steps, so logic cost and results do not depend on the frame rate.
+    Before drawing, tweened visuals are sampled at the render time between
+    the last step and the next one, so motion stays smooth at any frame rate.
+
+    While the current state is idle and the last frame has been drawn, the
+    loop blocks in pygame.event.wait instead of polling and redrawing, so a
+    game waiting for a keypress uses next to no CPU.
+    """
+
+    def __init__(self, screen, clock, state_machine, tick_rate=60, idle_timeout_ms=500, window=None):
+        self.screen = screen
+        self.window = window  # If set, screen is a low-resolution buffer upscaled into it
+        self.clock = clock
+        self.state_machine = state_machine
+        self.step = 1 / tick_rate
+        self.accumulator = 0.0
+        self.handlers: dict[str, StateHandler] = {}
+
+        # --- Idle handling ---
+        self.idle_enabled = True
+        self.idle_timeout_ms = idle_timeout_ms  # Longest single sleep
+        self.needs_redraw = True
+        self._pending_events = []  # Event that woke the loop, handled by the next step
+
+    def register(self, state_id, handler):
+        """Sets the handler used while the state machine is in state_id."""
+        self.handlers[state_id] = handler
+
+    def get_handler(self):
+        """Returns the handler of the current state."""
+        return self.handlers[self.state_machine.current_state.id]
+
+    def run(self):
+        """Runs frames until the window is closed."""
+        if GM.surface_counter is not None:
+            GM.surface_counter.count = 0  # Loading before the first frame is not a frame's allocation
+        while True:
+            self.run_frame()
+
+    def is_idle(self):
+        """Returns whether the loop can sleep until the next event."""
+        return self.idle_enabled and not self.needs_redraw and self.get_handler().is_idle()
+
+    def wait_for_event(self):
+        """
+        Sleeps until an event arrives or the idle timeout passes.
+        Returns True if an event arrived (it is kept for the next step).
+        """
+        event = pygame.event.wait(self.idle_timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return False
+
+        self._pending_events.append(event)
+        return True
+
+    def run_frame(self):
+        """Runs the fixed steps due since the last frame, then renders once."""
+        if self.is_idle():
+            if not self.wait_for_event():
+                return
+
+            # --- Woken by an event: drop the time spent asleep and react right away ---
+            self.clock.tick()
+            self.accumulator = self.step
+            self.needs_redraw = True
+        else:
+            frame_time = min(self.clock.tick(GM.get_frame_rate_cap()) / 1000, GM.max_frame_dt)
+            self.accumulator += frame_time * GM.time_scale
+
+        # --- Spend the accumulated time in fixed steps (bounded to avoid a spiral of death) ---
+        max_steps = max(1, math.ceil(GM.max_frame_dt * GM.time_scale / self.step))
+        steps = 0
+        while self.accumulator >= self.step:
+            if steps == max_steps:
+                self.accumulator = 0.0
+                break
+            self.run_step()
+            self.accumulator -= self.step
+            steps += 1
+
+        # --- Render, with tweens sampled part of the way into the next step ---
+        GM.animation_manager.sample(self.accumulator)
+        handler = self.get_handler()
+        changed_rects = handler.draw(self.screen)
+        if self.window is not None:
+            changed_rects = self.present_upscaled(changed_rects)
+
+        if changed_rects is None:
+            pygame.display.update()
+        elif changed_rects:
+            pygame.display.update(changed_rects)
+
+        # --- Once an idle state has been drawn, nothing changes until the next event ---
+        self.needs_redraw = not handler.is_idle()
+
+        if GM.surface_counter is not None:
+            GM.surface_counter.end_frame()
+
+    def present_upscaled(self, changed_rects):
+        """
+        Scales the low-resolution screen into the window by its integer
+        factor, only where it changed. Returns the window rectangles to update.
+        """
+        scale = self.window.get_width() // self.screen.get_width()
+
+        if changed_rects is None:
+            pygame.transform.scale(self.screen, self.window.get_size(), self.window)
+            return None
+
+        window_rects = []
+        for rect in changed_rects:
+            window_rect = pygame.Rect(rect.x * scale, rect.y * scale, rect.width * scale, rect.height * scale)
+            pygame.transform.scale(self.screen.subsurface(rect), window_rect.size, self.window.subsurface(window_rect))
+            window_rects.append(window_rect)
+        return window_rects
+
+    def run_step(self):
+        """Advances the game by one fixed step."""
+        GM.advance_time(self.step)
+
+        # --- Resolve animations; finishing an action ends the action phase ---
+        if GM.has_animations():
+            state_id = self.state_machine.current_state.id
+            GM.resolve_animations()
+            if GM.hud_manager is not None:
+                GM.hud_manager.update()
+
+            # (Only if the animations were started in the action phase, not by a move that entered it)
+            if not GM.has_animations() and state_id == "player_action_phase":
+                self.state_machine.player_action_complete()
+
+        handler = self.get_handler()
+        if handler.accepts_input():
+            events = self._pending_events + pygame.event.get()
+            self._pending_events.clear()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    exit()
+                handler.handle_event(event)
+
+        handler.update(self.step)
@@ -1,4 +1,8 @@
-from scripts.animation import AnimationManager, Animation
+from scripts.animation import AnimationManager, Animation, FRAME_TIME
+from scripts.asset_manager import AssetManager
+from scripts.batch_tween import EASE_LINEAR
+from scripts.entity_pool import EntityPool
+from scripts.simulation import MonteCarloBrain
 
 
 class GameManager:
@@ -16,14 +20,40 @@ class GameManager:
             # --- Initialize core game attributes ---
             cls._instance.current_level = None
             cls._instance.player = None
+            cls._instance.particles = None  # Shared ParticleSystem
             cls._instance.death_cloud = None
+            cls._instance.hud_manager = None  # Created when the game starts
+            cls._instance.assets = AssetManager()
+            cls._instance.enemy_registry = None
+            cls._instance.entity_pool = EntityPool()
+            cls._instance.surface_counter = None  # SurfaceAllocationCounter, when debugging allocations
+
+            # --- Lookahead AI (used by enemies with the 'lookahead' AI profile) ---
+            cls._instance.lookahead_brain = MonteCarloBrain(
+                rollouts_per_action=16,
+                depth=3,
+                time_budget=0.01,  # Seconds per enemy turn
+                workers=0  # > 0 runs rollouts in a process pool
+            )
             cls._instance.render_tile_size = 0
+            cls._instance.sprite_scale = 1  # Render pixels per source sprite pixel
             cls._instance.screen_width = 0
             cls._instance.screen_height = 0
 
             # --- Initialize animation manager ---
             cls._instance.animation_manager = AnimationManager()
-            cls._instance.ANIMATION_DELAY_FRAMES = 30
+            cls._instance.ANIMATION_DELAY = 0.5  # Seconds for level animations (doors, chests, camera)
+
+            # --- Frame timing (delta time, in seconds) ---
+            cls._instance.tick_rate = 60  # Fixed logic updates per second (see GameLoop)
+            cls._instance.target_fps = 60  # Render frame rate cap
+            cls._instance.max_frame_dt = 0.1  # Clamp for long stalls (window drags, breakpoints)
+            cls._instance.frame_dt = FRAME_TIME
+            cls._instance.game_time = 0.0
+
+            # --- Fast-forward (soak tests, replays) ---
+            cls._instance.time_scale = 1.0  # Multiplies the time every frame advances by
+            cls._instance.instant_mode = False  # Resolve all animations within one update
 
             # --- State machine (will be initialized in main.py) ---
             cls._instance.state_machine = None
@@ -43,12 +73,57 @@ class GameManager:
         """Add an animation to the manager."""
         self.animation_manager.add_animation(animation)
 
+    def add_tween(self, target, attributes, start_value, end_value, duration_frames=None,
+                  easing=EASE_LINEAR, on_complete_callback=None, duration=None):
+        """Add a batched tween of a pair of attributes (see AnimationManager.tween)."""
+        self.animation_manager.tween(target, attributes, start_value, end_value, duration_frames,
+                                     easing, on_complete_callback, duration)
+
+    def schedule(self, delay, callback, blocking=True):
+        """
+        Runs callback after delay seconds of game time (see AnimationManager.schedule).
+        Blocking timers keep the game locked until they fire.
+        """
+        return self.animation_manager.schedule(delay, callback, blocking)
+
+    def advance_time(self, dt):
+        """
+        Records the game time advanced by the current update (seconds).
+        Called by the GameLoop before each fixed step, which already applies
+        time_scale and the max_frame_dt clamp.
+        """
+        self.frame_dt = dt
+        self.game_time += dt
+
+    def set_time_scale(self, time_scale):
+        """Speeds up (> 1) or slows down (< 1) every animation and effect."""
+        if time_scale <= 0:
+            raise ValueError(f"time_scale must be positive, got {time_scale}")
+        self.time_scale = time_scale
+
+    def set_instant_mode(self, enabled):
+        """
+        Turns instant mode on or off. In instant mode every animation and
+        callback chain resolves synchronously in resolve_animations(), and the
+        main loop runs without a frame rate cap.
+        """
+        self.instant_mode = enabled
+        print(f"[STATE] Instant mode {'on' if enabled else 'off'}")
+
+    def get_frame_rate_cap(self):
+        """Returns the FPS the main loop should tick at (0 = uncapped)."""
+        return 0 if self.instant_mode else self.target_fps
+
     def resolve_animations(self):
         """
-        Called every frame to update all active animations.
+        Called every frame to advance all active animations by frame_dt.
+        In instant mode, runs them all to completion instead.
         Returns True if animations are still running.
         """
-        return self.animation_manager.update()
+        if self.instant_mode:
+            self.animation_manager.resolve_all()
+            return False
+        return self.animation_manager.update(self.frame_dt)
 
     def start_enemy_turn(self):
         """Start enemy turn processing."""
@@ -56,6 +131,7 @@ class GameManager:
 
         # --- Execute enemy actions ---
         if self.current_level:
+            self.current_level.start_enemy_phase()
             enemy_actions_taken = self.current_level.execute_enemy_turns()
 
             # --- Check if there are any animations running ---
@@ -1,11 +1,15 @@
 import pygame
 
-from scripts.animation import TileSequenceAnimation, InterpolationAnimation
-from scripts.entityClasses.ghost import Ghost
+from scripts.ai_blackboard import SquadDirector
+from scripts.animation import TileSequenceAnimation
+from scripts.camera import Camera
+from scripts.fog_of_war import FogOfWar
 from scripts.game_manager import GM
 from scripts.level_actions import LevelActions
+from scripts.spatial_index import SpatialIndex
 from scripts.support import import_csv_layout
 from scripts.tileset import Tile
+from scripts.turn_scheduler import TurnScheduler
 
 levels = {
     'test': {
@@ -17,21 +21,27 @@ levels = {
 
 class Level:
     def __init__(self, level_data, tile_map_loader):
-        self.target_offset_y = None
-        self.target_offset_x = None
         self.tile_map_loader = tile_map_loader
         self.terrain_data = import_csv_layout(level_data['terrain'])
         self.enemy_data = import_csv_layout(level_data['enemy'])
         self.enemies = pygame.sprite.Group()
-        self._enemies_taken_turn_this_phase = set()
+        self.enemy_index = SpatialIndex()  # Enemies by grid position (tile lookups, culling)
+        self._visible_enemies = set()  # Enemies drawn last frame
+        self.turn_scheduler = TurnScheduler()
+        self.squads = SquadDirector(self)
+        self._walkable_cells = None
 
         # Track animated tiles - MUST be initialized before setup_level_surface()
         self.animated_tiles: dict[tuple[int, int], TileSequenceAnimation] = {}
+        self._drawn_animated_tiles: dict[tuple[int, int], int] = {}  # Tile ID last drawn per animated tile
+        self.changed_tile_rects: list[pygame.Rect] = []  # Map regions redrawn since last pop_changed_rects()
+        self.tile_width = 0
+        self.tile_height = 0
 
         self.level_surface = self.setup_level_surface()
+        self.fog = FogOfWar(self)
         self.spawn_enemies_from_csv()
-        self.offset_x = 0.0
-        self.offset_y = 0.0
+        self.camera = Camera(GM.screen_width, GM.screen_height, GM.render_tile_size)
 
         # Initialize action handler
         self.actions = LevelActions(self)
@@ -42,8 +52,8 @@ class Level:
             return pygame.Surface((0, 0))
 
         sample_sprite = self.tile_map_loader.get_tile(Tile.GROUND.value)
-        tile_width = sample_sprite.get_width()
-        tile_height = sample_sprite.get_height()
+        tile_width = self.tile_width = sample_sprite.get_width()
+        tile_height = self.tile_height = sample_sprite.get_height()
 
         map_width = len(self.terrain_data[0]) * tile_width
         map_height = len(self.terrain_data) * tile_height
@@ -68,32 +78,83 @@ class Level:
 
         return map_surface
 
+    def redraw_tile(self, pos_x, pos_y):
+        """
+        Redraws one tile of the level surface in place (instead of rebuilding
+        the whole map) and records the changed region.
+        """
+        tile_index = int(self.terrain_data[pos_y][pos_x])
+        if (pos_x, pos_y) in self.animated_tiles:
+            tile_index = self.animated_tiles[(pos_x, pos_y)].get_current_tile_id()
+
+        rect = pygame.Rect(pos_x * self.tile_width, pos_y * self.tile_height, self.tile_width, self.tile_height)
+        self.level_surface.fill((0, 0, 0, 0), rect)
+        if tile_index != Tile.EMPTY.value:
+            self.level_surface.blit(self.tile_map_loader.get_tile(tile_index), rect)
+
+        self.changed_tile_rects.append(rect)
+
+    def update_animated_tiles(self):
+        """Redraws the animated tiles whose displayed frame changed."""
+        for pos_key, anim in self.animated_tiles.items():
+            tile_index = anim.get_current_tile_id()
+            if self._drawn_animated_tiles.get(pos_key) != tile_index:
+                self._drawn_animated_tiles[pos_key] = tile_index
+                self.redraw_tile(*pos_key)
+
+        # --- Forget tiles whose animation has finished ---
+        if len(self._drawn_animated_tiles) > len(self.animated_tiles):
+            for pos_key in list(self._drawn_animated_tiles):
+                if pos_key not in self.animated_tiles:
+                    del self._drawn_animated_tiles[pos_key]
+
+    def pop_changed_rects(self):
+        """Returns and clears the map regions (world pixels) redrawn since the last call."""
+        rects = self.changed_tile_rects
+        self.changed_tile_rects = []
+        return rects
+
     def spawn_enemies_from_csv(self):
         """Creates and places enemies based on level data"""
         if not self.enemy_data:
             return
 
-        # Ensure the enemy group is empty before spawning
-        self.enemies.empty()
+        # Return any existing enemies to the pool before spawning
+        for enemy in list(self.enemies):
+            self.despawn_enemy(enemy)
+        self.turn_scheduler.clear()
 
         for row_index, row in enumerate(self.enemy_data):
             for col_index, tile_id_str in enumerate(row):
                 tile_index = int(tile_id_str)
 
-                if tile_index != Tile.EMPTY.value:
+                if tile_index == Tile.EMPTY.value:
+                    continue
 
-                    # Determine which enemy type to spawn based on tile_index
-                    # NOTE: You must map tile IDs from your enemy layer CSV to specific Enemy classes.
+                if self.spawn_enemy(tile_index, col_index, row_index) is None:
+                    print(f"[LEVEL] No enemy archetype for tile ID {tile_index} at ({col_index}, {row_index})")
 
-                    if tile_index == Tile.GHOST_LARGE.value:
-                        # Instantiate the concrete enemy class
-                        new_enemy = Ghost(
-                            tile_map_loader=self.tile_map_loader,
-                            spawn_x=col_index,
-                            spawn_y=row_index
-                        )
-                        # Add the enemy to the level's enemy group
-                        self.enemies.add(new_enemy)
+    def spawn_enemy(self, tile_id, pos_x, pos_y):
+        """
+        Spawns the enemy archetype mapped to tile_id at the given grid position,
+        reusing a pooled enemy when one is free.
+        Returns the enemy, or None if tile_id has no archetype.
+        """
+        new_enemy = GM.enemy_registry.spawn(tile_id, pos_x, pos_y, pool=GM.entity_pool)
+        if new_enemy is None:
+            return None
+
+        # Add the enemy to the level's enemy group and turn order
+        self.enemies.add(new_enemy)
+        self.enemy_index.insert(new_enemy)
+        self.turn_scheduler.add(new_enemy)
+        return new_enemy
+
+    def despawn_enemy(self, enemy):
+        """Removes an enemy from the level and returns it to the entity pool."""
+        self.turn_scheduler.remove(enemy)
+        self.enemy_index.remove(enemy)
+        GM.entity_pool.release(enemy)
 
     def get_tile_at(self, pos_x, pos_y):
         """Returns tile ID at x, y."""
@@ -113,8 +174,15 @@ class Level:
         max_cols = len(self.terrain_data[0]) if max_rows > 0 else 0
 
         if 0 <= pos_x < max_cols and 0 <= pos_y < max_rows:
+            old_tile_id = int(self.terrain_data[pos_y][pos_x])
             self.terrain_data[pos_y][pos_x] = str(new_tile_id)
-            self.level_surface = self.setup_level_surface()
+
+            # --- Keep the cached walkable set (shared with simulations) unless walkability changed ---
+            walkable_tiles = Tile.get_walkable_tiles()
+            if (old_tile_id in walkable_tiles) != (int(new_tile_id) in walkable_tiles):
+                self._walkable_cells = None
+            self.redraw_tile(pos_x, pos_y)
+            self.fog.on_tile_changed(pos_x, pos_y)
             return True
         return False
 
@@ -122,6 +190,54 @@ class Level:
         """Helper function to check if tile is walkable"""
         return self.get_tile_at(target_x, target_y) in Tile.get_walkable_tiles()
 
+    def has_line_of_sight(self, from_x, from_y, to_x, to_y):
+        """
+        Returns whether no view-blocking tile lies strictly between two grid
+        positions (Bresenham line; walkable, interactive and empty tiles do not block).
+        """
+        dx = abs(to_x - from_x)
+        dy = abs(to_y - from_y)
+        step_x = 1 if to_x > from_x else -1
+        step_y = 1 if to_y > from_y else -1
+        err = dx - dy
+
+        walkable = Tile.get_walkable_tiles()
+        selectable = Tile.get_selectable_tiles()
+        current_x, current_y = from_x, from_y
+
+        while current_x != to_x or current_y != to_y:
+            # --- Check the CURRENT tile (before stepping) ---
+            if current_x != from_x or current_y != from_y:
+                tile_id = self.get_tile_at(current_x, current_y)
+                if tile_id not in walkable and tile_id not in selectable and tile_id != Tile.EMPTY.value:
+                    return False
+
+            # --- Step toward the target using the error term ---
+            e2 = 2 * err
+            if e2 > -dy:
+                err -= dy
+                current_x += step_x
+            if e2 < dx:
+                err += dx
+                current_y += step_y
+
+        return True
+
+    def get_walkable_cells(self):
+        """
+        Returns an immutable set of all walkable grid positions.
+        Cached until the terrain changes, so simulations can share it.
+        """
+        if self._walkable_cells is None:
+            walkable_tiles = Tile.get_walkable_tiles()
+            self._walkable_cells = frozenset(
+                (col_index, row_index)
+                for row_index, row in enumerate(self.terrain_data)
+                for col_index, tile_id_str in enumerate(row)
+                if int(tile_id_str) in walkable_tiles
+            )
+        return self._walkable_cells
+
     def get_enemy_at(self, pos_x, pos_y):
         """
         Returns the enemy at the given grid position, or None if no enemy there
@@ -132,79 +248,38 @@ class Level:
         Returns:
             Enemy object if found, None otherwise
         """
-        for enemy in self.enemies:
-            if enemy.is_alive and enemy.grid_x == pos_x and enemy.grid_y == pos_y:
+        for enemy in self.enemy_index.at(pos_x, pos_y):
+            if enemy.is_alive:
                 return enemy
         return None
 
-    def set_initial_camera_position(self, offset_x, offset_y):
-        """
-        Sets the initial camera position without animation.
-        Should be called once after player is positioned.
-        """
-        self.offset_x = float(offset_x)
-        self.offset_y = float(offset_y)
-        self.target_offset_x = float(offset_x)
-        self.target_offset_y = float(offset_y)
+    def get_visible_enemies(self):
+        """Returns the enemies on (or just off) screen, in spawn order."""
+        visible = self.enemy_index.query(*self.camera.visible_tile_bounds())
+        visible.sort(key=lambda enemy: enemy.entity_id)
+        return visible
 
-    def animate_camera_to(self, target_offset_x, target_offset_y, duration_frames=None):
-        """
-        Smoothly animates the camera from current position to target position.
+    def update_enemy_effects(self, dt):
+        """Advances the damage flashes of the enemies on screen by dt seconds."""
+        for enemy in self._visible_enemies:
+            enemy.update_damage_flash(dt)
 
-        Args:
-            target_offset_x: Target X offset
-            target_offset_y: Target Y offset
-            duration_frames: Animation duration (defaults to GM.ANIMATION_DELAY_FRAMES)
+    def draw_enemies(self, display_surface):
         """
-
-        if duration_frames is None:
-            duration_frames = GM.ANIMATION_DELAY_FRAMES
-
-        # Store the starting position
-        start_offset_x = self.offset_x
-        start_offset_y = self.offset_y
-
-        # Store target
-        self.target_offset_x = target_offset_x
-        self.target_offset_y = target_offset_y
-
-        # Create interpolation animation for offset_x
-        offset_x_animation = InterpolationAnimation(
-            target_object=self,
-            property_name='offset_x',
-            start_value=start_offset_x,
-            end_value=target_offset_x,
-            duration_frames=duration_frames,
-            easing_function=InterpolationAnimation.ease_in_out_quad
-        )
-
-        # Create interpolation animation for offset_y
-        offset_y_animation = InterpolationAnimation(
-            target_object=self,
-            property_name='offset_y',
-            start_value=start_offset_y,
-            end_value=target_offset_y,
-            duration_frames=duration_frames,
-            easing_function=InterpolationAnimation.ease_in_out_quad
-        )
-
-        # Add both animations
-        GM.add_animation(offset_x_animation)
-        GM.add_animation(offset_y_animation)
-
-    def draw(self, display_surface):
+        Positions and draws the enemies on screen only. Enemies off screen skip
+        their visual update (their logical state is unaffected); a damage
+        flash that scrolls out of view just ends.
         """
-        Draws the single, pre-rendered map surface to the display.
-        Uses the animated offset values for smooth camera movement.
-        """
-        # Rebuild surface if there are animated tiles
-        if self.animated_tiles:
-            self.level_surface = self.setup_level_surface()
-
-        display_surface.blit(self.level_surface, (round(self.offset_x), round(self.offset_y)))
+        visible = self.get_visible_enemies()
+        visible_set = set(visible)
+        for enemy in self._visible_enemies - visible_set:
+            if enemy.is_flashing:
+                enemy.stop_damage_flash()
+        self._visible_enemies = visible_set
 
-        self.enemies.update()
-        self.enemies.draw(display_surface)
+        for enemy in visible:
+            enemy.update()
+        display_surface.blits([(enemy.image, enemy.rect) for enemy in visible], doreturn=0)
 
     def process_action(self, pos_x, pos_y, tile_id):
         """
@@ -241,6 +316,11 @@ class Level:
         """
         The main AI driver for the level. Called by the GameManager once the
         player's turn is finished and animations are resolved.
+
+        Enemies act in order of their scheduled action time. A fast enemy that is
+        due again while still animating its previous action stops the batch;
+        the main loop calls this again once animations settle
+        (see has_pending_enemy_turns).
         Returns True if any enemy took an action, False otherwise.
         """
         if not self.enemies:
@@ -248,40 +328,50 @@ class Level:
             return False
 
         player_pos = GM.player.get_grid_pos()
-        print(f"[ENEMY DEBUG] Processing {len(self.enemies)} enemies")
+        print(f"[ENEMY DEBUG] Processing enemies due by t={self.turn_scheduler.current_time}")
 
         any_actions_taken = False
 
-        # Iterate over a copy of the group to allow removal (death) during iteration
-        for enemy in list(self.enemies):
-            # Check if enemy is ready, alive, and hasn't taken a turn this phase
-            enemy_id = id(enemy)  # Unique identifier for each enemy
+        while True:
+            ready = self.turn_scheduler.pop_ready()
+            if ready is None:
+                break
+
+            action_time, enemy = ready
+
+            if not enemy.is_alive:
+                print(f"[ENEMY DEBUG] Enemy is dead, skipping")
+                continue
 
-            if (enemy.is_alive and not enemy.is_moving and
-                    enemy_id not in self._enemies_taken_turn_this_phase):
+            if enemy.is_moving and GM.has_animations():
+                # --- Still animating an earlier action, act again once it settles ---
+                print(f"[ENEMY DEBUG] Enemy is still moving, deferring")
+                self.turn_scheduler.push(enemy, action_time)
+                break
 
-                print(f"[ENEMY DEBUG] Enemy at {enemy.get_grid_pos()} taking turn")
-                self._enemies_taken_turn_this_phase.add(enemy_id)
+            print(f"[ENEMY DEBUG] Enemy {enemy.entity_id} at {enemy.get_grid_pos()} taking turn")
 
-                # take_turn() will handle both decision-making AND execution
-                # It returns True if an action was taken
-                action_taken = enemy.take_turn(player_pos)
+            # take_turn() will handle both decision-making AND execution
+            # It returns True if an action was taken
+            action_taken = enemy.take_turn(player_pos)
+            self.turn_scheduler.reschedule(enemy, action_time)
 
-                if action_taken:
-                    any_actions_taken = True
-                    print(f"[ENEMY DEBUG] Enemy took action")
-                else:
-                    print(f"[ENEMY DEBUG] Enemy could not act")
+            if action_taken:
+                any_actions_taken = True
+                print(f"[ENEMY DEBUG] Enemy took action")
             else:
-                if not enemy.is_alive:
-                    print(f"[ENEMY DEBUG] Enemy is dead, skipping")
-                elif enemy.is_moving:
-                    print(f"[ENEMY DEBUG] Enemy is still moving, skipping")
-                elif enemy_id in self._enemies_taken_turn_this_phase:
-                    print(f"[ENEMY DEBUG] Enemy already took turn this phase, skipping")
+                print(f"[ENEMY DEBUG] Enemy could not act")
 
         return any_actions_taken
 
-    def reset_enemy_turn_tracking(self):
-        """Reset which enemies have taken their turn for the current phase."""
-        self._enemies_taken_turn_this_phase.clear()
+    def has_pending_enemy_turns(self):
+        """Returns True if any enemy is still due to act this enemy phase."""
+        return self.turn_scheduler.has_ready()
+
+    def start_enemy_phase(self):
+        """
+        Advances the turn clock by one player turn and refreshes the shared
+        squad perception at the start of the enemy phase.
+        """
+        self.turn_scheduler.advance()
+        self.squads.begin_phase(GM.player.get_grid_pos())
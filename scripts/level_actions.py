@@ -38,7 +38,7 @@ class LevelActions:
             pos_x=pos_x,
             pos_y=pos_y,
             frame_sequence=frame_sequence,
-            duration_frames=GM.ANIMATION_DELAY_FRAMES,
+            duration=GM.ANIMATION_DELAY,
             on_complete_callback=on_complete
         )
 
@@ -70,7 +70,7 @@ class LevelActions:
             pos_x=pos_x,
             pos_y=pos_y,
             frame_sequence=frame_sequence,
-            duration_frames=GM.ANIMATION_DELAY_FRAMES,
+            duration=GM.ANIMATION_DELAY,
             on_complete_callback=on_complete
         )
 
@@ -102,7 +102,7 @@ class LevelActions:
             pos_x=pos_x,
             pos_y=pos_y,
             frame_sequence=frame_sequence,
-            duration_frames=GM.ANIMATION_DELAY_FRAMES,
+            duration=GM.ANIMATION_DELAY,
             on_complete_callback=on_complete
         )
 
@@ -133,7 +133,7 @@ class LevelActions:
             pos_x=pos_x,
             pos_y=pos_y,
             frame_sequence=frame_sequence,
-            duration_frames=GM.ANIMATION_DELAY_FRAMES,
+            duration=GM.ANIMATION_DELAY,
             on_complete_callback=on_complete
         )
 
@@ -208,7 +208,7 @@ class LevelActions:
             pos_x=pos_x,
             pos_y=pos_y,
             frame_sequence=bottom_frame_sequence,
-            duration_frames=GM.ANIMATION_DELAY_FRAMES // 2,  # Faster toggle
+            duration=GM.ANIMATION_DELAY / 2,  # Faster toggle
             on_complete_callback=on_bottom_complete
         )
 
@@ -218,7 +218,7 @@ class LevelActions:
             pos_x=pos_x,
             pos_y=top_pos_y,
             frame_sequence=top_frame_sequence,
-            duration_frames=GM.ANIMATION_DELAY_FRAMES // 2,  # Same duration
+            duration=GM.ANIMATION_DELAY / 2,  # Same duration
             on_complete_callback=on_top_complete
         )
 
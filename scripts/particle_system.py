@@ -0,0 +1,140 @@
+"""
+Pooled particle system: every live particle is a row in fixed-capacity
+NumPy arrays, updated in one vectorized step and drawn with one blits call.
+"""
+import math
+
+import numpy as np
+import pygame
+
+
+class ParticleType:
+    """
+    Describes one kind of particle (e.g. death clouds). Particles are filled
+    circles that fly off in a random direction and shrink until they vanish.
+    """
+
+    def __init__(self, name, color, min_radius, max_radius, speed, decay_rate, burst_count=10):
+        self.name = name
+        self.color = color
+        self.min_radius = min_radius  # Initial radius range, pixels
+        self.max_radius = max_radius
+        self.speed = speed  # Max velocity per axis, pixels per second
+        self.decay_rate = decay_rate  # Radius lost per second
+        self.burst_count = burst_count  # Particles per burst unless told otherwise
+
+
+class ParticleSystem:
+    """
+    Holds the particles of every registered ParticleType in one pool.
+
+    Positions, velocities, radii, decay rates and type indices are NumPy
+    arrays of a fixed capacity; live particles occupy the first `count`
+    rows. Dead particles are compacted out in one step, bursts beyond the
+    capacity are truncated, and each type's circle sprites are rendered
+    once at registration, so a frame costs a few array operations plus
+    one blits call however many particles are alive.
+    """
+
+    def __init__(self, capacity=16384, pixel_scale=1.0, seed=None):
+        self.capacity = capacity
+        self.pixel_scale = pixel_scale  # Size/speed multiplier (0.5 when rendering at native resolution)
+        self.count = 0
+
+        # --- Particle pool ---
+        self._position = np.zeros((capacity, 2))
+        self._velocity = np.zeros((capacity, 2))
+        self._radius = np.zeros(capacity)
+        self._decay = np.zeros(capacity)
+        self._type = np.zeros(capacity, dtype=np.int32)
+
+        # --- Registered types and their pre-rendered sprites ---
+        self.types: list[ParticleType] = []
+        self._type_index: dict[str, int] = {}
+        self._sprites: list[list] = []  # type index -> radius -> circle sprite
+
+        # Visual only, so independent of the game's random state
+        self._rng = np.random.default_rng(seed)
+
+    def register(self, particle_type):
+        """Adds a particle type and pre-renders its circle sprites. Returns its index."""
+        if particle_type.name in self._type_index:
+            return self._type_index[particle_type.name]
+
+        index = len(self.types)
+        self.types.append(particle_type)
+        self._type_index[particle_type.name] = index
+
+        largest = math.ceil(particle_type.max_radius * self.pixel_scale)
+        sprites = [None]
+        for radius in range(1, largest + 1):
+            circle = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(circle, particle_type.color, (radius, radius), radius)
+            sprites.append(circle)
+        self._sprites.append(sprites)
+        return index
+
+    def burst(self, name, start_pos, num_particles=None):
+        """Emits a burst of particles of the named type at start_pos."""
+        index = self._type_index[name]
+        particle_type = self.types[index]
+        if num_particles is None:
+            num_particles = particle_type.burst_count
+
+        num_particles = min(num_particles, self.capacity - self.count)
+        if num_particles <= 0:
+            return
+
+        rows = slice(self.count, self.count + num_particles)
+        scale = self.pixel_scale
+        self._position[rows] = start_pos
+        self._velocity[rows] = self._rng.uniform(-particle_type.speed, particle_type.speed,
+                                                 (num_particles, 2)) * scale
+        self._radius[rows] = self._rng.integers(particle_type.min_radius, particle_type.max_radius,
+                                                num_particles, endpoint=True) * scale
+        self._decay[rows] = particle_type.decay_rate * scale
+        self._type[rows] = index
+        self.count += num_particles
+
+    def update(self, dt):
+        """Removes faded particles, then moves and shrinks the rest by dt seconds."""
+        if not self.count:
+            return
+
+        self._delete_faded_particles()
+        live = slice(0, self.count)
+        self._position[live] += self._velocity[live] * dt
+        self._radius[live] -= self._decay[live] * dt
+
+    def draw(self, surface):
+        """Draws every visible particle with a single blits call."""
+        if not self.count:
+            return
+
+        radius = self._radius[:self.count].astype(np.int32)
+        visible = radius > 0
+        radius = radius[visible]
+        corners = self._position[:self.count][visible].astype(np.int32) - radius[:, None]
+        types = self._type[:self.count][visible]
+
+        sprites = self._sprites
+        surface.blits(
+            [(sprites[particle_type][r], (x, y))
+             for particle_type, r, (x, y) in zip(types.tolist(), radius.tolist(), corners.tolist())],
+            doreturn=0
+        )
+
+    def _delete_faded_particles(self):
+        """Compacts the particles whose radius is still positive to the front of the pool."""
+        alive = self._radius[:self.count] > 0
+        survivors = int(np.count_nonzero(alive))
+        if survivors == self.count:
+            return
+
+        for array in (self._position, self._velocity, self._radius, self._decay, self._type):
+            array[:survivors] = array[:self.count][alive]
+        self.count = survivors
+
+    def clear(self):
+        """Removes every particle."""
+        self.count = 0
@@ -132,3 +132,43 @@ def get_next_step_towards(level, start_x, start_y, goal_x, goal_y):
         return path[1]  # Return the next step (index 0 is current position)
 
     return None
+
+
+def compute_distance_field(level, goal_x, goal_y, max_distance=None):
+    """
+    Computes the walking distance from every reachable tile to the goal using a
+    single BFS. Lets many entities path towards the same goal without each
+    running its own search.
+
+    Args:
+        level: The Level instance
+        goal_x: Goal X position
+        goal_y: Goal Y position
+        max_distance: Stop expanding past this distance (None for unlimited)
+
+    Returns:
+        Dict mapping (x, y) to the number of steps needed to reach the goal
+    """
+    field = {(goal_x, goal_y): 0}
+    queue = deque([(goal_x, goal_y)])
+
+    while queue:
+        x, y = queue.popleft()
+        dist = field[(x, y)]
+
+        if max_distance is not None and dist >= max_distance:
+            continue
+
+        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            next_pos = (x + dx, y + dy)
+
+            if next_pos in field:
+                continue
+
+            if not level.is_walkable(next_pos[0], next_pos[1]):
+                continue
+
+            field[next_pos] = dist + 1
+            queue.append(next_pos)
+
+    return field
@@ -0,0 +1,137 @@
+"""
+Render queue: systems submit (surface, dest, layer) items, and the queue
+draws them sorted by layer with one Surface.blits call per layer.
+"""
+import pygame
+
+# --- Draw layers (lower layers are drawn first) ---
+LAYER_ENEMIES = 10
+LAYER_FOG = 15  # Fog of war (over the world, under the UI overlays)
+LAYER_OVERLAY = 20  # Movement range, cursor, action selector
+LAYER_PLAYER = 30
+LAYER_PARTICLES = 40
+LAYER_HUD = 50
+LAYER_TOP = 60  # Full-screen overlays (pause)
+
+
+def item_key(item):
+    """
+    Returns what identifies a queued (source, dest[, area[, special_flags]])
+    item from one frame to the next: (source id, x, y, area, special_flags).
+    The position is copied out, so a dest Rect moved later does not change it.
+    """
+    dest = item[1]
+    area = item[2] if len(item) > 2 else None
+    return (id(item[0]), dest[0], dest[1],
+            None if area is None else tuple(pygame.Rect(area)),
+            item[3] if len(item) > 3 else 0)
+
+
+def key_rect(key, source):
+    """Returns the screen rectangle covered by the item with this key (see item_key)."""
+    _, x, y, area, _ = key
+    if area is not None:
+        return pygame.Rect(x, y, area[2], area[3])
+    return pygame.Rect(x, y, source.get_width(), source.get_height())
+
+
+class RecordingSurface:
+    """
+    Stand-in for the display surface that records blits instead of doing them.
+    Passed to the usual draw functions so each layer reports what it draws.
+
+    Items are stored as given; their rectangles are only worked out when
+    asked for (a blit's return value, or the renderer's frame comparison).
+    """
+
+    def __init__(self, size):
+        self._size = size
+        self.items = []  # (source, dest[, area[, special_flags]]), as passed to blit/blits
+
+    def reset(self):
+        """Drops the recorded items (start of a frame)."""
+        self.items.clear()
+
+    def get_size(self):
+        return self._size
+
+    def get_width(self):
+        return self._size[0]
+
+    def get_height(self):
+        return self._size[1]
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self._size)
+        for attribute, value in kwargs.items():
+            setattr(rect, attribute, value)
+        return rect
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        """Records the blit and returns the affected rectangle, like Surface.blit."""
+        item = (source, dest, area, special_flags)
+        self.items.append(item)
+        return key_rect(item_key(item), source)
+
+    def blits(self, blit_sequence, doreturn=1):
+        """Records a sequence of blits, like Surface.blits (rects are only built if doreturn)."""
+        start = len(self.items)
+        self.items.extend(blit_sequence)
+        if doreturn:
+            return [key_rect(item_key(item), item[0]) for item in self.items[start:]]
+        return None
+
+
+class RenderQueue:
+    """
+    Collects one frame's draw items by layer.
+
+    Items within a layer keep their submission order; layers are flushed in
+    ascending order, each with a single Surface.blits call, so the per-blit
+    Python overhead of the individual draw functions goes away and the
+    draw order no longer depends on the order systems happen to run in.
+
+    The per-layer recorders are reused from frame to frame; a layer nothing
+    was drawn on this frame just has no items.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._layers: dict[int, RecordingSurface] = {}
+        self._order: list[int] = []  # Layer ids, sorted
+
+    def clear(self):
+        """Drops every submitted item (call at the start of a frame)."""
+        for recorder in self._layers.values():
+            recorder.reset()
+
+    def surface(self, layer):
+        """
+        Returns a surface-like recorder for a layer, for draw functions that
+        call blit/blits (sprite groups, entity draw methods).
+        """
+        recorder = self._layers.get(layer)
+        if recorder is None:
+            recorder = RecordingSurface(self.size)
+            self._layers[layer] = recorder
+            self._order = sorted(self._layers)
+        return recorder
+
+    def submit(self, source, dest, layer, area=None, special_flags=0):
+        """Queues one blit on a layer. Returns the affected rectangle."""
+        return self.surface(layer).blit(source, dest, area, special_flags)
+
+    def layers(self):
+        """Returns (layer, items) pairs in draw order."""
+        return [(layer, self._layers[layer].items) for layer in self._order]
+
+    def flush(self, target):
+        """
+        Draws the queued items onto target, one blits call per layer.
+        To redraw only a region, set it as target's clip rect first: items
+        outside it are rejected by the blit itself.
+        """
+        for layer in self._order:
+            items = self._layers[layer].items
+            if items:
+                target.blits(items, doreturn=0)
@@ -0,0 +1,367 @@
+"""
+Lightweight copy-on-write game state snapshots and Monte-Carlo lookahead AI.
+
+Snapshots hold only logical state (walkable cells, entity positions and
+health, player) and no pygame objects, so they are cheap to fork, can be
+discarded freely and can be sent to worker processes.
+"""
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+# --- Enemy actions ---
+ACTION_WAIT = "wait"
+ACTION_MOVE = "move"
+ACTION_ATTACK = "attack"
+
+
+class GameSnapshot:
+    """
+    Logical game state with copy-on-write entity storage.
+
+    Entities are stored as entity_id -> (x, y, health). A fork shares the
+    entity dict with its parent until either of them writes to it.
+    The walkable cell set is never modified and is shared by all forks.
+    """
+    __slots__ = ('walkable', 'player', 'player_move_speed', 'player_attack', '_entities', '_owns_entities')
+
+    def __init__(self, walkable, entities, player, player_move_speed=1, player_attack=1):
+        self.walkable = walkable  # frozenset of (x, y)
+        self.player = player  # (x, y, health)
+        self.player_move_speed = player_move_speed
+        self.player_attack = player_attack
+        self._entities = entities
+        self._owns_entities = True
+
+    @classmethod
+    def from_level(cls, level, player, center=None, radius=None):
+        """
+        Captures the logical state of a level.
+        If center and radius are given, only enemies within that Manhattan
+        radius of center are included.
+        """
+        entities = {}
+        for enemy in level.enemies:
+            if not enemy.is_alive:
+                continue
+            if center is not None and radius is not None:
+                if abs(enemy.grid_x - center[0]) + abs(enemy.grid_y - center[1]) > radius:
+                    continue
+            entities[enemy.entity_id] = (enemy.grid_x, enemy.grid_y, enemy.current_health)
+
+        return cls(
+            walkable=level.get_walkable_cells(),
+            entities=entities,
+            player=(player.grid_x, player.grid_y, player.current_health),
+            player_move_speed=player.move_speed,
+            player_attack=player.attack_dmg
+        )
+
+    def __getstate__(self):
+        return self.walkable, self.player, self.player_move_speed, self.player_attack, self._entities
+
+    def __setstate__(self, state):
+        self.walkable, self.player, self.player_move_speed, self.player_attack, self._entities = state
+        self._owns_entities = True
+
+    def fork(self):
+        """Returns a child snapshot sharing this snapshot's entity storage until either writes."""
+        child = GameSnapshot.__new__(GameSnapshot)
+        child.walkable = self.walkable
+        child.player = self.player
+        child.player_move_speed = self.player_move_speed
+        child.player_attack = self.player_attack
+        child._entities = self._entities
+        child._owns_entities = False
+        self._owns_entities = False
+        return child
+
+    def _writable_entities(self):
+        """Copies the shared entity storage before the first write."""
+        if not self._owns_entities:
+            self._entities = dict(self._entities)
+            self._owns_entities = True
+        return self._entities
+
+    # --- Queries ---
+
+    def get_entity(self, entity_id):
+        """Returns (x, y, health) of an entity, or None if it is not in the snapshot."""
+        return self._entities.get(entity_id)
+
+    def entity_ids(self):
+        """Returns the IDs of all entities in the snapshot."""
+        return list(self._entities)
+
+    def entity_items(self):
+        """Returns a view of (entity_id, (x, y, health)) pairs."""
+        return self._entities.items()
+
+    def is_free(self, pos_x, pos_y):
+        """Returns True if the cell is walkable and not occupied by the player or an entity."""
+        if (pos_x, pos_y) not in self.walkable:
+            return False
+        if self.player[0] == pos_x and self.player[1] == pos_y:
+            return False
+        for x, y, _ in self._entities.values():
+            if x == pos_x and y == pos_y:
+                return False
+        return True
+
+    def get_enemy_actions(self, entity_id):
+        """
+        Returns the actions available to an enemy, most aggressive first:
+        attacking an adjacent player, moving to a free neighbouring cell, or waiting.
+        """
+        x, y, _ = self._entities[entity_id]
+        player_x, player_y, _ = self.player
+
+        actions = []
+        if abs(player_x - x) + abs(player_y - y) == 1:
+            actions.append((ACTION_ATTACK, (player_x, player_y)))
+
+        moves = [(x + dx, y + dy) for dx, dy in DIRECTIONS if self.is_free(x + dx, y + dy)]
+        moves.sort(key=lambda pos: abs(player_x - pos[0]) + abs(player_y - pos[1]))
+        actions.extend((ACTION_MOVE, pos) for pos in moves)
+
+        actions.append((ACTION_WAIT, None))
+        return actions
+
+    # --- Mutations ---
+
+    def move_entity(self, entity_id, pos_x, pos_y):
+        _, _, health = self._entities[entity_id]
+        self._writable_entities()[entity_id] = (pos_x, pos_y, health)
+
+    def damage_entity(self, entity_id, amount):
+        """Damages an entity, removing it from the snapshot if it dies."""
+        entities = self._writable_entities()
+        x, y, health = entities[entity_id]
+        health -= amount
+        if health <= 0:
+            del entities[entity_id]
+        else:
+            entities[entity_id] = (x, y, health)
+
+    def damage_player(self, amount):
+        x, y, health = self.player
+        self.player = (x, y, health - amount)
+
+    def apply_enemy_action(self, entity_id, action):
+        """Applies an action from get_enemy_actions for the given enemy."""
+        kind, target = action
+        if kind == ACTION_ATTACK:
+            self.damage_player(1)
+        elif kind == ACTION_MOVE:
+            self.move_entity(entity_id, target[0], target[1])
+
+
+# --- Rollout policies (module level so worker processes can run them) ---
+
+def _simulate_player_turn(state, rng):
+    """Player policy: usually attack an adjacent enemy, otherwise wander up to move_speed cells."""
+    player_x, player_y, _ = state.player
+
+    adjacent = [
+        entity_id for entity_id, (x, y, _) in state.entity_items()
+        if abs(x - player_x) + abs(y - player_y) == 1
+    ]
+    if adjacent and rng.random() < 0.7:
+        state.damage_entity(rng.choice(adjacent), state.player_attack)
+        return
+
+    for _ in range(rng.randint(0, state.player_move_speed)):
+        dx, dy = rng.choice(DIRECTIONS)
+        if state.is_free(player_x + dx, player_y + dy):
+            player_x += dx
+            player_y += dy
+            state.player = (player_x, player_y, state.player[2])
+
+
+def _simulate_enemy_turn(state, entity_id, rng):
+    """Enemy policy: attack when adjacent, otherwise step greedily towards the player."""
+    x, y, _ = state.get_entity(entity_id)
+    player_x, player_y, _ = state.player
+    distance = abs(player_x - x) + abs(player_y - y)
+
+    if distance == 1:
+        state.damage_player(1)
+        return
+
+    steps = [
+        (x + dx, y + dy) for dx, dy in DIRECTIONS
+        if abs(player_x - x - dx) + abs(player_y - y - dy) < distance and state.is_free(x + dx, y + dy)
+    ]
+    if steps:
+        step_x, step_y = rng.choice(steps)
+        state.move_entity(entity_id, step_x, step_y)
+
+
+def _score(state, root, actor_id):
+    """Scores a rolled-out state from the acting enemy's point of view."""
+    damage_dealt = root.player[2] - state.player[2]
+    root_health = root.get_entity(actor_id)[2]
+
+    actor = state.get_entity(actor_id)
+    if actor is None:
+        return damage_dealt * 5.0 - root_health * 3.0 - 20.0
+
+    distance = abs(state.player[0] - actor[0]) + abs(state.player[1] - actor[1])
+    return damage_dealt * 5.0 - (root_health - actor[2]) * 3.0 - distance * 0.2
+
+
+def run_rollouts(snapshot, actor_id, action, depth, seeds):
+    """
+    Plays out one rollout per seed after the actor takes the given action.
+    Returns the list of scores.
+    """
+    scores = []
+    for seed in seeds:
+        rng = random.Random(seed)
+        state = snapshot.fork()
+        state.apply_enemy_action(actor_id, action)
+
+        for _ in range(depth):
+            if state.player[2] <= 0 or state.get_entity(actor_id) is None:
+                break
+            _simulate_player_turn(state, rng)
+            for entity_id in state.entity_ids():
+                if state.player[2] <= 0:
+                    break
+                if state.get_entity(entity_id) is not None:
+                    _simulate_enemy_turn(state, entity_id, rng)
+
+        scores.append(_score(state, snapshot, actor_id))
+    return scores
+
+
+# --- Worker process state (set once per pool by _init_worker) ---
+_worker_walkable = None
+
+
+def _init_worker(walkable):
+    """Pool initializer: receives the walkable cell set once, instead of with every batch."""
+    global _worker_walkable
+    _worker_walkable = walkable
+
+
+def _run_rollouts_in_worker(snapshot, actor_id, action, depth, seeds):
+    """Pool task: run_rollouts on a snapshot sent without its walkable set."""
+    snapshot.walkable = _worker_walkable
+    return run_rollouts(snapshot, actor_id, action, depth, seeds)
+
+
+class MonteCarloBrain:
+    """
+    Chooses enemy actions by simulating a few turns ahead on GameSnapshots.
+
+    Rollouts run inline, or in a process pool when workers > 0, and stop
+    once time_budget (seconds per enemy turn) is used up.
+
+    The pool's workers receive the walkable cell set once, when the pool
+    starts; batches carry only the small per-turn state. The pool is
+    restarted when the walkable set changes (doors opening), which is rare.
+    """
+
+    def __init__(self, rollouts_per_action=16, depth=3, time_budget=0.01, workers=0, batch_size=4):
+        self.rollouts_per_action = rollouts_per_action
+        self.depth = depth
+        self.time_budget = time_budget
+        self.workers = workers
+        self.batch_size = batch_size
+        self._executor = None
+        self._executor_walkable = None  # Walkable set the pool's workers were started with
+        self._decisions = 0
+
+    def _get_executor(self, walkable):
+        if self._executor is not None and self._executor_walkable is not walkable:
+            self.shutdown()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(walkable,))
+            self._executor_walkable = walkable
+        return self._executor
+
+    def shutdown(self):
+        """Stops the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_walkable = None
+
+    def choose_action(self, snapshot, actor_id):
+        """
+        Returns the best action for the actor as (kind, target_pos).
+        Falls back to the most aggressive action if no rollout finishes in time.
+        """
+        actions = snapshot.get_enemy_actions(actor_id)
+        if len(actions) == 1:
+            return actions[0]
+
+        self._decisions += 1
+        deadline = time.perf_counter() + self.time_budget
+        totals = [0.0] * len(actions)
+        counts = [0] * len(actions)
+
+        # --- Seeds depend only on the decision and action so results are reproducible ---
+        def seeds_for(action_index, start):
+            base = (self._decisions * 1_000_003 + actor_id * 7919 + action_index) * 10_000
+            return [base + start + i for i in range(self.batch_size)]
+
+        if self.workers > 0:
+            self._evaluate_in_pool(snapshot, actor_id, actions, seeds_for, deadline, totals, counts)
+        else:
+            self._evaluate_inline(snapshot, actor_id, actions, seeds_for, deadline, totals, counts)
+
+        best_index = 0
+        best_mean = None
+        for index in range(len(actions)):
+            if counts[index] == 0:
+                continue
+            mean = totals[index] / counts[index]
+            if best_mean is None or mean > best_mean:
+                best_index = index
+                best_mean = mean
+
+        return actions[best_index]
+
+    def _evaluate_inline(self, snapshot, actor_id, actions, seeds_for, deadline, totals, counts):
+        """Runs batches round-robin over the actions until done or out of time."""
+        for start in range(0, self.rollouts_per_action, self.batch_size):
+            for index, action in enumerate(actions):
+                if time.perf_counter() >= deadline and min(counts) > 0:
+                    return
+                scores = run_rollouts(snapshot, actor_id, action, self.depth, seeds_for(index, start))
+                totals[index] += sum(scores)
+                counts[index] += len(scores)
+
+    def _evaluate_in_pool(self, snapshot, actor_id, actions, seeds_for, deadline, totals, counts):
+        """Submits every batch to the worker pool and collects what finishes before the deadline."""
+        executor = self._get_executor(snapshot.walkable)
+
+        # --- The workers already have the walkable set; send the snapshot without it ---
+        task_snapshot = snapshot.fork()
+        task_snapshot.walkable = None
+
+        pending = {}
+        for start in range(0, self.rollouts_per_action, self.batch_size):
+            for index, action in enumerate(actions):
+                future = executor.submit(_run_rollouts_in_worker, task_snapshot, actor_id, action, self.depth,
+                                         seeds_for(index, start))
+                pending[future] = index
+
+        while pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                scores = future.result()
+                totals[index] += sum(scores)
+                counts[index] += len(scores)
+
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,91 @@
+"""
+Spatial hash of entities by grid position, for point lookups (what is on
+this tile?) and region queries (what is on screen?).
+"""
+
+CELL_SIZE = 8  # Tiles per bucket side
+
+
+class SpatialIndex:
+    """
+    Buckets entities by their grid position into CELL_SIZE x CELL_SIZE
+    tile cells. Entities report their own moves (see Entity.grid_x), so
+    lookups never scan the whole entity list: a tile lookup checks one
+    bucket and a region query only the buckets overlapping the region.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self._buckets: dict[tuple[int, int], dict] = {}  # cell -> {entity: None} (insertion ordered)
+        self._cells: dict = {}  # entity -> cell it is filed under
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __contains__(self, entity):
+        return entity in self._cells
+
+    def _cell_of(self, grid_x, grid_y):
+        return grid_x // self.cell_size, grid_y // self.cell_size
+
+    def insert(self, entity):
+        """Adds an entity at its current grid position and lets it report its moves."""
+        cell = self._cell_of(entity.grid_x, entity.grid_y)
+        self._buckets.setdefault(cell, {})[entity] = None
+        self._cells[entity] = cell
+        entity.spatial_index = self
+
+    def remove(self, entity):
+        """Removes an entity (no-op if it is not indexed)."""
+        cell = self._cells.pop(entity, None)
+        if cell is None:
+            return
+        bucket = self._buckets[cell]
+        del bucket[entity]
+        if not bucket:
+            del self._buckets[cell]
+        entity.spatial_index = None
+
+    def update(self, entity):
+        """Re-files an entity after its grid position changed."""
+        cell = self._cell_of(entity.grid_x, entity.grid_y)
+        old_cell = self._cells.get(entity)
+        if old_cell == cell or old_cell is None:
+            return
+
+        bucket = self._buckets[old_cell]
+        del bucket[entity]
+        if not bucket:
+            del self._buckets[old_cell]
+        self._buckets.setdefault(cell, {})[entity] = None
+        self._cells[entity] = cell
+
+    def at(self, grid_x, grid_y):
+        """Returns the entities on a tile."""
+        bucket = self._buckets.get(self._cell_of(grid_x, grid_y))
+        if not bucket:
+            return []
+        return [entity for entity in bucket if entity.grid_x == grid_x and entity.grid_y == grid_y]
+
+    def query(self, min_x, min_y, max_x, max_y):
+        """Returns the entities whose grid position lies in the tile rectangle (inclusive bounds)."""
+        min_cell_x, min_cell_y = self._cell_of(min_x, min_y)
+        max_cell_x, max_cell_y = self._cell_of(max_x, max_y)
+
+        found = []
+        for cell_y in range(min_cell_y, max_cell_y + 1):
+            for cell_x in range(min_cell_x, max_cell_x + 1):
+                bucket = self._buckets.get((cell_x, cell_y))
+                if not bucket:
+                    continue
+                for entity in bucket:
+                    if min_x <= entity.grid_x <= max_x and min_y <= entity.grid_y <= max_y:
+                        found.append(entity)
+        return found
+
+    def clear(self):
+        """Removes every entity."""
+        for entity in self._cells:
+            entity.spatial_index = None
+        self._buckets.clear()
+        self._cells.clear()
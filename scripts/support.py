@@ -1,7 +1,12 @@
+from collections import OrderedDict
 from csv import reader
 
 import pygame
 
+# --- Sprite variants ---
+VARIANT_CACHE_SIZE = 128  # Most recently used variants kept per sheet
+VARIANT_SCALE_STEP = 0.05  # Squash/stretch factors are rounded to this step
+
 
 def import_csv_layout(path):
     """
@@ -16,58 +21,102 @@ def import_csv_layout(path):
 
 
 class SpriteSheet:
-    def __init__(self, filename, tile_width, tile_height, scale_factor=2):
-        """Loads the tileset image and stores the tile dimensions."""
-        self.sheet = pygame.image.load(filename).convert_alpha()
+    def __init__(self, filename, tile_width, tile_height, scale_factor=2, warm_up=False, image=None):
+        """
+        Loads the tileset image, scales it once into the atlas and builds the
+        table of tile rectangles. With warm_up, every tile view is created now
+        instead of on first use. An already decoded image (see AssetManager)
+        may be passed instead of loading filename.
+        """
+        if image is None:
+            image = pygame.image.load(filename)
+        self.sheet = image.convert_alpha()
         self.tile_width = tile_width
         self.tile_height = tile_height
         self.cols = self.sheet.get_width() // tile_width
         self.rows = self.sheet.get_height() // tile_height
         self.scale_factor = scale_factor
 
+        # --- Atlas: the whole sheet scaled once (tiles are subsurface views into it) ---
+        if scale_factor != 1:
+            self.atlas = pygame.transform.scale(
+                self.sheet,
+                (self.sheet.get_width() * scale_factor, self.sheet.get_height() * scale_factor)
+            )
+        else:
+            self.atlas = self.sheet
+
+        # Index -> rect of the tile in the atlas
+        scaled_width = tile_width * scale_factor
+        scaled_height = tile_height * scale_factor
+        self.tile_rects = [
+            pygame.Rect(col * scaled_width, row * scaled_height, scaled_width, scaled_height)
+            for row in range(self.rows)
+            for col in range(self.cols)
+        ]
+
         # Dictionary to store cached individual tile surfaces
         self.tiles = {}
 
+        # Transformed copies of tiles (squash, tint, silhouette), least recently used first
+        self.variants = OrderedDict()
+
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self):
+        """Creates the views of all tiles up front, so none is created mid-game."""
+        for index in range(len(self.tile_rects)):
+            self.get_tile(index)
+
     def get_tile(self, index):
         """
-        Extracts a specific tile from the sheet based on its index (0-131).
-        If the tile is already extracted, it is returned from the cache.
+        Returns a specific tile from the sheet based on its index (0-131).
+        Tiles are views into the atlas (no pixel copy); they must not be modified.
         """
-        if index in self.tiles:
-            return self.tiles[index]
-
-        # Calculate the tile's position in the grid
-        row = index // self.cols
-        col = index % self.cols
-
-        # Calculate the pixel coordinates
-        x = col * self.tile_width
-        y = row * self.tile_height
-
-        # Create a Surface for the individual tile
-        tile_surface = pygame.Surface(
-            (self.tile_width, self.tile_height),
-            pygame.SRCALPHA
-        )
-
-        # Blit (copy) the area of the sprite sheet onto the new surface
-        tile_surface.blit(
-            self.sheet,
-            (0, 0),
-            (x, y, self.tile_width, self.tile_height)
-        )
-
-        if self.scale_factor != 1:
-            new_width = self.tile_width * self.scale_factor
-            new_height = self.tile_height * self.scale_factor
-
-            # Use pygame.transform.scale() to resize the surface
-            scaled_surface = pygame.transform.scale(
-                tile_surface, (new_width, new_height)
-            )
-            self.tiles[index] = scaled_surface
-            return scaled_surface
+        tile = self.tiles.get(index)
+        if tile is None:
+            tile = self.atlas.subsurface(self.tile_rects[index])
+            self.tiles[index] = tile
+        return tile
+
+    def get_variant(self, index, scale=(1.0, 1.0), tint=None, silhouette=None):
+        """
+        Returns a transformed version of a tile, built once and then reused.
+
+        Args:
+            index: Tile index, as for get_tile.
+            scale: (x, y) squash/stretch factors, rounded to VARIANT_SCALE_STEP.
+            tint: RGBA colour multiplied into the tile (BLEND_MULT), or None.
+            silhouette: RGBA colour to fill the tile's opaque pixels with, or None.
+
+        The returned surface is shared and must not be modified.
+        """
+        scale_x = round(scale[0] / VARIANT_SCALE_STEP)
+        scale_y = round(scale[1] / VARIANT_SCALE_STEP)
+        unscaled = round(1 / VARIANT_SCALE_STEP)
+        if scale_x == unscaled and scale_y == unscaled and tint is None and silhouette is None:
+            return self.get_tile(index)
+
+        key = (index, scale_x, scale_y, tint, silhouette)
+        variant = self.variants.get(key)
+        if variant is not None:
+            self.variants.move_to_end(key)
+            return variant
+
+        variant = self.get_tile(index)
+        if silhouette is not None:
+            mask = pygame.mask.from_surface(variant)
+            variant = mask.to_surface(setcolor=silhouette, unsetcolor=(0, 0, 0, 0))
+        if tint is not None:
+            variant = variant.copy()
+            variant.fill(tint, special_flags=pygame.BLEND_MULT)
+        if scale_x != unscaled or scale_y != unscaled:
+            new_width = int(variant.get_width() * scale_x * VARIANT_SCALE_STEP)
+            new_height = int(variant.get_height() * scale_y * VARIANT_SCALE_STEP)
+            variant = pygame.transform.scale(variant, (new_width, new_height))
 
-        # Store in cache and return
-        self.tiles[index] = tile_surface
-        return tile_surface
+        self.variants[key] = variant
+        if len(self.variants) > VARIANT_CACHE_SIZE:
+            self.variants.popitem(last=False)
+        return variant
@@ -0,0 +1,97 @@
+"""
+Debug counter of pygame surfaces allocated per frame, so code that creates
+surfaces in the render loop shows up as soon as it is introduced.
+"""
+import functools
+
+import pygame
+
+# --- pygame.transform functions that return a new surface unless given a destination ---
+TRANSFORM_FUNCTIONS = ('scale', 'smoothscale', 'scale_by', 'smoothscale_by', 'rotate', 'rotozoom', 'flip',
+                       'scale2x', 'grayscale')
+DEST_ARGUMENT_INDEX = {'scale': 2, 'smoothscale': 2, 'scale2x': 1, 'grayscale': 1}
+
+
+class SurfaceAllocationCounter:
+    """
+    Wraps the module-level pygame calls that allocate pixel memory (the
+    Surface constructor, image.load and the transform functions) with a
+    counter, and reports the count at the end of every frame that
+    allocated anything.
+
+    Methods of pygame's own types cannot be wrapped (the types are
+    immutable), so Surface.copy/convert/convert_alpha and Mask.to_surface
+    are NOT counted. Subsurfaces are views into existing pixels and are
+    not counted either.
+
+    A steady-state frame (nothing loading, no new sprite variants) should
+    report nothing.
+    """
+
+    def __init__(self, report=True):
+        self.report = report  # Print a line for every frame that allocated
+        self.count = 0  # Allocations in the current frame
+        self.last_frame = 0
+        self.peak = 0
+        self.frames = 0
+        self.frames_with_allocations = 0
+        self._originals = None
+
+    @property
+    def installed(self):
+        return self._originals is not None
+
+    def install(self):
+        """Starts counting. Surfaces created by pygame.Surface(...) from now on are counted."""
+        if self.installed:
+            return
+        counter = self
+        self._originals = {'Surface': pygame.Surface, 'load': pygame.image.load}
+
+        class CountedSurface(pygame.Surface):
+            def __init__(self, *args, **kwargs):
+                counter.count += 1
+                super().__init__(*args, **kwargs)
+
+        pygame.Surface = CountedSurface
+        pygame.image.load = self._counted(pygame.image.load)
+
+        for name in TRANSFORM_FUNCTIONS:
+            function = getattr(pygame.transform, name, None)
+            if function is not None:
+                self._originals['transform.' + name] = function
+                setattr(pygame.transform, name, self._counted(function, DEST_ARGUMENT_INDEX.get(name)))
+
+    def uninstall(self):
+        """Restores the original pygame functions."""
+        if not self.installed:
+            return
+        pygame.Surface = self._originals.pop('Surface')
+        pygame.image.load = self._originals.pop('load')
+        for key, function in self._originals.items():
+            setattr(pygame.transform, key.removeprefix('transform.'), function)
+        self._originals = None
+
+    def _counted(self, function, dest_index=None):
+        """Wraps function so each call counts one allocation (none if it writes into a given dest_surface)."""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            writes_into_dest = dest_index is not None and (len(args) > dest_index or 'dest_surface' in kwargs)
+            if not writes_into_dest:
+                self.count += 1
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    def end_frame(self):
+        """Closes the current frame's count and returns it."""
+        allocations = self.count
+        self.count = 0
+        self.last_frame = allocations
+        self.peak = max(self.peak, allocations)
+        self.frames += 1
+        if allocations:
+            self.frames_with_allocations += 1
+            if self.report:
+                print(f"[PERF] Frame {self.frames}: {allocations} surface(s) allocated")
+        return allocations
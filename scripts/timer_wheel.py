@@ -0,0 +1,169 @@
+"""
+Hierarchical timer wheel for deferred game callbacks (delays between steps,
+staggered spawns), kept separate from the visual animations and tweens.
+"""
+import math
+
+SLOT_BITS = 6
+SLOTS_PER_LEVEL = 1 << SLOT_BITS  # 64 slots per wheel level
+SLOT_MASK = SLOTS_PER_LEVEL - 1
+LEVELS = 4  # Covers 64^4 ticks (about 77 hours at 60 ticks per second)
+TICK_EPSILON = 1e-6
+
+
+class Timer:
+    """Handle for a scheduled callback. Call cancel() to stop it from firing."""
+    __slots__ = ('wheel', 'deadline_tick', 'callback', 'blocking', 'is_cancelled')
+
+    def __init__(self, wheel, deadline_tick, callback, blocking):
+        self.wheel = wheel
+        self.deadline_tick = deadline_tick
+        self.callback = callback
+        self.blocking = blocking
+        self.is_cancelled = False
+
+    def cancel(self):
+        """Stops the timer if it has not fired yet."""
+        if not self.is_cancelled:
+            self.is_cancelled = True
+            self.wheel._forget(self)
+
+
+class TimerWheel:
+    """
+    Schedules callbacks at a tick resolution (one reference frame by default).
+
+    Each level has 64 slots. Level 0 slots are one tick wide and each level
+    above is 64 times coarser; a timer lives in the level matching how far
+    away it is and drops down a level as its time approaches. Scheduling and
+    cancelling are O(1), and advancing only visits the slots of the ticks
+    that actually passed (nothing at all while no timers are pending).
+
+    Blocking timers are part of a game action (e.g. the pause between path
+    steps) and keep the game locked like an animation does.
+    """
+
+    def __init__(self, resolution=1 / 60):
+        self.resolution = resolution
+        self.now = 0.0
+        self.tick = 0  # Last tick processed
+        self.blocking_count = 0
+        self._count = 0
+        self._wheels = [[[] for _ in range(SLOTS_PER_LEVEL)] for _ in range(LEVELS)]
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, delay, callback, blocking=True):
+        """
+        Runs callback (no arguments) once delay seconds have passed.
+        The deadline is rounded up to a whole tick and is at least one tick away.
+
+        Returns:
+            The Timer, which can be cancelled.
+        """
+        deadline_tick = max(self.tick + 1, math.ceil((self.now + delay) / self.resolution - TICK_EPSILON))
+        timer = Timer(self, deadline_tick, callback, blocking)
+        self._insert(timer)
+
+        self._count += 1
+        if blocking:
+            self.blocking_count += 1
+        return timer
+
+    def _insert(self, timer):
+        """Puts a timer in the slot of the finest level that can hold its distance."""
+        distance = timer.deadline_tick - self.tick
+        level = 0
+        while level < LEVELS - 1 and distance >= 1 << (SLOT_BITS * (level + 1)):
+            level += 1
+        slot = (timer.deadline_tick >> (SLOT_BITS * level)) & SLOT_MASK
+        self._wheels[level][slot].append(timer)
+
+    def _forget(self, timer):
+        """Updates the counters for a cancelled or fired timer."""
+        self._count -= 1
+        if timer.blocking:
+            self.blocking_count -= 1
+
+    def _cascade(self, level):
+        """Moves the timers of the current slot of a level down to finer levels."""
+        slot = (self.tick >> (SLOT_BITS * level)) & SLOT_MASK
+        timers = self._wheels[level][slot]
+        if not timers:
+            return
+        self._wheels[level][slot] = []
+        for timer in timers:
+            if not timer.is_cancelled:
+                self._insert(timer)
+
+    def advance_to(self, now):
+        """
+        Moves the wheel to time now (seconds).
+
+        Returns:
+            List of due callbacks, in deadline order (then scheduling order).
+        """
+        self.now = now
+        target_tick = math.floor(now / self.resolution + TICK_EPSILON)
+
+        if not self._count:
+            self.tick = max(self.tick, target_tick)
+            return []
+
+        callbacks = []
+        while self.tick < target_tick and self._count:
+            self.tick += 1
+
+            # --- Refill finer levels whenever a coarser slot boundary is crossed ---
+            level = 1
+            while level < LEVELS and (self.tick & ((1 << (SLOT_BITS * level)) - 1)) == 0:
+                self._cascade(level)
+                level += 1
+
+            slot = self.tick & SLOT_MASK
+            due = self._wheels[0][slot]
+            if not due:
+                continue
+            self._wheels[0][slot] = []
+
+            for timer in due:
+                if timer.is_cancelled:
+                    continue
+                timer.is_cancelled = True
+                self._forget(timer)
+                callbacks.append(timer.callback)
+
+        self.tick = max(self.tick, target_tick)
+        return callbacks
+
+    def next_expiry_time(self):
+        """
+        Returns the time (seconds) of the earliest pending timer, or infinity.
+        Used to fast-forward in instant mode; scans the wheel, so not for per-frame use.
+        """
+        if not self._count:
+            return math.inf
+
+        for offset in range(1, SLOTS_PER_LEVEL):
+            tick = self.tick + offset
+            for timer in self._wheels[0][tick & SLOT_MASK]:
+                if not timer.is_cancelled and timer.deadline_tick == tick:
+                    return tick * self.resolution
+
+        earliest = min(
+            (timer.deadline_tick for wheel in self._wheels for slot in wheel for timer in slot
+             if not timer.is_cancelled),
+            default=None
+        )
+        return math.inf if earliest is None else earliest * self.resolution
+
+    def clear(self):
+        """Drops every pending timer without running it."""
+        for wheel in self._wheels:
+            for slot in wheel:
+                for timer in slot:
+                    timer.is_cancelled = True
+                slot.clear()
+        self._count = 0
+        self.blocking_count = 0
@@ -0,0 +1,96 @@
+"""
+Energy/speed based turn scheduling for entities
+"""
+import heapq
+
+# --- Time Units ---
+ACTION_COST = 100  # Time one action takes for an entity at NORMAL_SPEED
+NORMAL_SPEED = 100  # Speed of an entity that acts once per player turn
+
+
+def get_action_delay(entity):
+    """
+    Returns the time until the entity may act again.
+    Faster entities (higher action_speed) get shorter delays.
+    """
+    speed = max(1, entity.action_speed)
+    return ACTION_COST * NORMAL_SPEED / speed
+
+
+class TurnScheduler:
+    """
+    Orders entity actions by their next action time using a binary heap.
+
+    Entries are (action_time, entity_id, entity), so ties are broken by the
+    stable entity ID rather than by sprite group iteration order.
+    Removal is lazy: stale heap entries are skipped when popped.
+    """
+
+    def __init__(self):
+        self.current_time = 0.0
+        self._queue: list[tuple[float, int, object]] = []
+        # Maps entity_id -> action time of its live heap entry
+        self._scheduled: dict[int, float] = {}
+
+    def __len__(self):
+        return len(self._scheduled)
+
+    def __contains__(self, entity):
+        return entity.entity_id in self._scheduled
+
+    def add(self, entity, delay=None):
+        """Enrolls an entity, scheduling its first action one delay from now."""
+        if delay is None:
+            delay = get_action_delay(entity)
+        self.push(entity, self.current_time + delay)
+
+    def push(self, entity, action_time):
+        """Schedules (or reschedules) an entity to act at action_time."""
+        self._scheduled[entity.entity_id] = action_time
+        heapq.heappush(self._queue, (action_time, entity.entity_id, entity))
+
+    def reschedule(self, entity, last_action_time):
+        """Schedules the entity's next action relative to when it last acted."""
+        self.push(entity, last_action_time + get_action_delay(entity))
+
+    def remove(self, entity):
+        """Removes an entity from the schedule (its heap entry is dropped lazily)."""
+        self._scheduled.pop(entity.entity_id, None)
+
+    def clear(self):
+        """Removes all entities and resets the clock."""
+        self._queue.clear()
+        self._scheduled.clear()
+        self.current_time = 0.0
+
+    def advance(self, duration=ACTION_COST):
+        """Moves the clock forward, by one player turn by default."""
+        self.current_time += duration
+
+    def _discard_stale(self):
+        """Pops heap entries that no longer match a live schedule."""
+        queue = self._queue
+        while queue:
+            action_time, entity_id, _ = queue[0]
+            if self._scheduled.get(entity_id) == action_time:
+                return
+            heapq.heappop(queue)
+
+    def has_ready(self):
+        """Returns True if any entity is due to act at the current time."""
+        self._discard_stale()
+        return bool(self._queue) and self._queue[0][0] <= self.current_time
+
+    def pop_ready(self):
+        """
+        Removes and returns the next entity due to act.
+
+        Returns:
+            Tuple (action_time, entity), or None if nobody is due yet.
+        """
+        if not self.has_ready():
+            return None
+
+        action_time, entity_id, entity = heapq.heappop(self._queue)
+        del self._scheduled[entity_id]
+        return action_time, entity